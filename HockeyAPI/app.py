@@ -1,27 +1,149 @@
-import colorama
-colorama.init = lambda *args, **kwargs: None  # Prevent tatsu/ics from repeatedly wrapping stdout
-
-from flask import Flask, jsonify, make_response
+from flask import Flask, jsonify, make_response, request
 from flask_caching import Cache
-from handlers.Event_Handler import EventHandler
+from handlers.Event_Stream import EVENT_STREAM_PORT, EventStream
+from handlers.Refresh_Scheduler import RefreshScheduler
+from handlers.Shared_Cache import SHARED_CACHE_PATH
+from handlers.Snapshot_Store import SNAPSHOT_DB_PATH, SnapshotStore
+from models.EncodedPayload import EncodedPayload
+from models.EventQuery import EventQuery
+from utils.Metrics import record_cache_lookup, record_coalesced_request, render_metrics
+from utils.Single_Flight import SingleFlight
 
 app = Flask(__name__)
-config = {'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 43200}
+# Cached responses are shared by every worker through SHARED_CACHE_PATH; empty keeps a cache per worker
+if SHARED_CACHE_PATH:
+    config = {'CACHE_TYPE': 'handlers.Shared_Cache.SharedCache', 'CACHE_SHARED_PATH': SHARED_CACHE_PATH,
+              'CACHE_DEFAULT_TIMEOUT': 43200}
+else:
+    config = {'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 43200}
 cache = Cache(app, config=config)
 app.json.sort_keys = False
+QUERY_CACHE_TIMEOUT = 60
+CHANGES_PAGE_SIZE = 1000
+# Concurrent misses for the same query key wait for one build instead of each querying and encoding the events
+query_flights = SingleFlight()
+
+# Snapshots are saved to SNAPSHOT_DB_PATH so restarted workers serve the last events right away; empty disables it
+scheduler = RefreshScheduler(snapshot_store=SnapshotStore(SNAPSHOT_DB_PATH) if SNAPSHOT_DB_PATH else None)
+scheduler.start()
+# Updates are pushed as Server-Sent Events on their own port, so open streams don't hold gunicorn threads.
+# An empty EVENT_STREAM_PORT disables it.
+if EVENT_STREAM_PORT:
+    event_stream = EventStream(scheduler, port=int(EVENT_STREAM_PORT))
+    event_stream.start()
 
 @app.route('/api/get_events', methods=['GET'])
-@cache.cached(timeout=43200)
 def get_events():
-    events = EventHandler().get_events()
-    response = make_response(jsonify(events))
+    timeout = scheduler.event_handler.REQUEST_DEADLINE_SECONDS
+    if not EventQuery.has_parameters(request.args):
+        # A hit is a request served from a snapshot that was already built, without waiting for the first one
+        record_cache_lookup('snapshot', scheduler.has_snapshot())
+        payload = scheduler.get_snapshot_payload(timeout=timeout)
+    else:
+        try:
+            query = EventQuery.from_args(request.args, scheduler.event_handler.DISPLAY_WINDOW_HOURS)
+        except ValueError as e:
+            return make_error_response(str(e), 400)
+
+        # The data version is part of the key, so a refresh invalidates every query, and workers holding the same
+        # source results share their cached responses
+        cache_key = f'events:{scheduler.data_version}:{query.get_cache_key()}'
+        payload = cache.get(cache_key)
+        record_cache_lookup('event_query', payload is not None)
+        if payload is None:
+            payload, shared = query_flights.do(cache_key, lambda: build_query_payload(cache_key, query, timeout))
+            if shared:
+                record_coalesced_request('event_query')
+    return make_payload_response(payload)
+
+"""
+Build and cache the response to an event query, unless a request that finished in the meantime, in this worker or
+another one, already cached it.
+Args:
+    cache_key (str): The query's cache key.
+    query (EventQuery): The filters.
+    timeout (float): Seconds to wait for the first snapshot to be built.
+Returns:
+    EncodedPayload: The encoded matching events.
+"""
+def build_query_payload(cache_key: str, query: EventQuery, timeout: float) -> EncodedPayload:
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = EncodedPayload.from_json(scheduler.query_events(query, timeout=timeout))
+        cache.set(cache_key, payload, timeout=QUERY_CACHE_TIMEOUT)
+    return payload
+
+"""
+Build a response from a pre-encoded payload, picking the compressed body that matches Accept-Encoding,
+or answering 304 Not Modified when the client already holds that body.
+Args:
+    payload (EncodedPayload): The payload.
+Returns:
+    Response: The response.
+"""
+def make_payload_response(payload: EncodedPayload):
+    encoding = payload.choose_encoding(request.accept_encodings)
+    etag = payload.get_etag(encoding)
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(payload.bodies[encoding])
+        response.mimetype = 'application/json'
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+"""
+Build a JSON error response.
+Args:
+    message (str): What was wrong with the request.
+    status (int): The HTTP status code.
+Returns:
+    Response: The response.
+"""
+def make_error_response(message: str, status: int):
+    response = make_response(jsonify({"error": message}), status)
     response.headers.add("Access-Control-Allow-Origin", "*")
     return response
 
+"""
+Get the changes to the events since a version, at most CHANGES_PAGE_SIZE at a time.
+Pass the returned version as since to get the next changes; more is true while there are more to get. When reset is
+true the changes since that version are no longer kept, so the client should load /api/get_events again and poll
+from the returned version.
+"""
+@app.route('/api/changes', methods=['GET'])
+def get_changes():
+    since = request.args.get('since', '0')
+    if not (since.isascii() and since.isdigit()):
+        return make_error_response('since must be a version number', 400)
+
+    result = scheduler.get_changes(int(since), CHANGES_PAGE_SIZE)
+    if result is None:
+        return make_error_response('changes are unavailable, try again later', 503)
+    changes, latest_version, reset = result
+    version = changes[-1]['version'] if changes else latest_version
+    response = jsonify({"version": version, "more": version < latest_version, "reset": reset, "changes": changes})
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    body, content_type = render_metrics()
+    response = make_response(body)
+    response.headers['Content-Type'] = content_type
+    return response
+
 @app.route('/api/clear_cache', methods=['GET'])
 def clear_cache():
     print('Clearing cache...')
     cache.clear()
+    scheduler.refresh_now()
     return make_response("success")
 
 if __name__ == "__main__":
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from models.TimeWindow import TimeWindow
+import utils.Web_Utils as Web_Utils
+
+MANIFEST_FILE = 'manifest.json'
+WINDOW_FORMAT = "%Y-%m-%d %H:%M:%S"
+RECORDED_HEADERS = ('Content-Type',)
+# Request headers that select what a response holds, e.g. ActiveCommunities sends the page number in page_info
+KEYED_HEADERS = ('page_info',)
+
+
+class FixtureStore:
+    """
+    A directory of recorded HTTP responses, keyed by request method, URL, KEYED_HEADERS and body.
+    The manifest also holds the fetch window the responses were recorded for, so replaying handlers with the same
+    window sends the same requests, whatever day the benchmark runs on.
+    It also holds how many events each handler returned when the responses were recorded, so a replay can check
+    that the handlers still parse them.
+    Attributes:
+        directory (str): The fixture directory.
+        window (TimeWindow | None): The window the fixtures were recorded for.
+        events (dict[str, int]): The number of events each handler returned, keyed by handler name.
+        responses (dict[str, dict]): The recorded responses' metadata, keyed by request key.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.window: TimeWindow | None = None
+        self.events: dict[str, int] = {}
+        self.responses: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    """
+    Load the manifest of a fixture directory.
+    Args:
+        directory (str): The fixture directory.
+    Returns:
+        FixtureStore: The fixtures, empty if the directory has no manifest.
+    """
+    @staticmethod
+    def load(directory: str) -> 'FixtureStore':
+        store = FixtureStore(directory)
+        try:
+            with open(os.path.join(directory, MANIFEST_FILE), 'r', encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        except OSError:
+            return store
+
+        window = manifest['window']
+        store.window = TimeWindow(datetime.strptime(window['start'], WINDOW_FORMAT),
+                                  datetime.strptime(window['end'], WINDOW_FORMAT))
+        store.events = manifest.get('events', {})
+        store.responses = manifest['responses']
+        return store
+
+    """
+    Write the manifest next to the recorded bodies.
+    """
+    def save(self) -> None:
+        manifest = {
+            'window': {
+                'start': self.window.start.strftime(WINDOW_FORMAT),
+                'end': self.window.end.strftime(WINDOW_FORMAT)
+            },
+            'events': self.events,
+            'responses': self.responses
+        }
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+    """
+    Record a response.
+    Args:
+        request (requests.PreparedRequest): The request that was sent.
+        response (requests.Response): The response it got.
+    """
+    def add(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        key = self.get_request_key(request)
+        body_file = f'{key}.body'
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, body_file), 'wb') as body:
+            body.write(response.content)
+        with self._lock:
+            self.responses[key] = {
+                'method': request.method,
+                'url': request.url,
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+                'body_file': body_file
+            }
+
+    """
+    Build the recorded response for a request.
+    Args:
+        request (requests.PreparedRequest): The request.
+    Returns:
+        requests.Response: The recorded response, or a 404 response if the request was never recorded.
+    """
+    def get_response(self, request: requests.PreparedRequest) -> requests.Response:
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        recorded = self.responses.get(self.get_request_key(request))
+        if recorded is None:
+            response.status_code = 404
+            response.reason = 'No Fixture'
+            response._content = b''
+            return response
+
+        with open(os.path.join(self.directory, recorded['body_file']), 'rb') as body:
+            response._content = body.read()
+        response.status_code = recorded['status']
+        response.reason = 'OK' if recorded['status'] < 400 else 'Recorded Error'
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+    """
+    Get the key of a request, from its method, URL, KEYED_HEADERS and body.
+    Args:
+        request (requests.PreparedRequest): The request.
+    Returns:
+        str: The request key.
+    """
+    @staticmethod
+    def get_request_key(request: requests.PreparedRequest) -> str:
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256()
+        digest.update(request.method.encode('utf-8') + b' ' + request.url.encode('utf-8') + b'\n')
+        for name in KEYED_HEADERS:
+            if name in request.headers:
+                digest.update(f'{name}: {request.headers[name]}\n'.encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Sends requests to the live sites and records every response into a FixtureStore.
+    """
+    def __init__(self, store: FixtureStore):
+        super().__init__(max_retries=Web_Utils.MAX_RETRIES)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.store.add(request, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Answers requests from a FixtureStore without touching the network.
+    """
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request, **kwargs):
+        return self.store.get_response(request)
+
+    def close(self):
+        pass
+
+
+"""
+Make every Web_Utils fetch go through a fixture adapter instead of the live session.
+The on-disk HTTP cache is pointed at a fresh temporary directory, so no conditional requests are sent and the
+host's cache is left alone.
+Args:
+    adapter (BaseAdapter): The RecordingAdapter or ReplayAdapter to mount.
+"""
+def install_adapter(adapter: BaseAdapter) -> None:
+    session = requests.Session()
+    session.headers.update({'User-Agent': Web_Utils.USER_AGENT})
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    Web_Utils.HTTP_CACHE_DIR = tempfile.mkdtemp(prefix='hockey-api-benchmark-')
+    with Web_Utils._session_lock:
+        Web_Utils._session = session
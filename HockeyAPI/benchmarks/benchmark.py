@@ -0,0 +1,421 @@
+"""
+Offline benchmark for the event pipeline.
+
+Record the responses of every location handler's sites once, with network access:
+    python -m benchmarks.benchmark record
+Then replay them as often as needed, without touching the network:
+    python -m benchmarks.benchmark replay [--iterations 20] [--handlers Eagan Rosemount]
+                                          [--save results.json] [--compare baseline.json --tolerance 0.25]
+Check that the committed fixtures still replay, e.g. before merging a parser change:
+    python -m benchmarks.benchmark check
+Measure how long a fresh worker takes to import app, and the memory traced while it does:
+    python -m benchmarks.benchmark startup [--iterations 10] [--save startup.json] [--compare baseline.json]
+
+Replay reports, per handler, the time to turn the recorded responses into events, the peak memory traced while
+doing it and the memory and blocks still held by the result. It then reports end-to-end EventHandler.get_events
+time and /api/get_events latency through Flask's test client. Startup runs each import in a new interpreter and also
+lists the heavy parser modules that were loaded before any source was refreshed. With --compare, the run exits with
+status 1 when a median time regressed by more than the tolerance against a saved baseline.
+Check replays every fixture once and exits with status 1 when a handler no longer returns the number of events it
+returned when the fixtures were recorded, an API request fails, or the regression comparison doesn't work.
+The fixtures in benchmarks/fixtures are synthetic pages in each site's format, with no real bookings in them.
+Run it from the HockeyAPI directory, like app.py.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
+from benchmarks.Fixture_Session import FixtureStore, RecordingAdapter, ReplayAdapter, install_adapter
+from handlers.Event_Handler import EventHandler
+from handlers.Refresh_Scheduler import RefreshScheduler
+from models.TimeWindow import TimeWindow
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pdfplumber', 'pdfminer', 'bs4', 'lxml', 'requests')
+# Burnsville sends the window as Unix times, so fixtures are recorded and replayed in one time zone
+FIXTURE_TIMEZONE = 'UTC'
+
+# Run in a fresh interpreter: import app without starting its refresh thread, then report the cost as JSON
+STARTUP_SCRIPT = '''
+import contextlib, io, json, sys, time, tracemalloc
+from unittest import mock
+trace = sys.argv[1] == 'trace'
+if trace:
+    tracemalloc.start()
+started_at = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    import handlers.Refresh_Scheduler
+    with mock.patch.object(handlers.Refresh_Scheduler.RefreshScheduler, 'start'):
+        import app
+seconds = time.perf_counter() - started_at
+size, peak = tracemalloc.get_traced_memory() if trace else (0, 0)
+print(json.dumps({
+    'ms': seconds * 1000,
+    'traced_kib': size / 1024,
+    'peak_kib': peak / 1024,
+    'modules': len(sys.modules),
+    'heavy_modules': [name for name in sys.argv[2:] if name in sys.modules]
+}))
+'''
+
+
+"""
+Record the responses of every selected handler's sites into the fixture directory.
+Args:
+    event_handler (EventHandler): The event handler whose location handlers are recorded.
+    handler_names (list[str] | None): The handlers to record, or None for all of them.
+    fixture_dir (str): The fixture directory.
+"""
+def record(event_handler: EventHandler, handler_names: list[str] | None, fixture_dir: str) -> None:
+    store = FixtureStore.load(fixture_dir)
+    store.window = event_handler.get_fetch_window()
+    install_adapter(RecordingAdapter(store))
+    for handler in get_handlers(event_handler, handler_names):
+        name = event_handler.get_handler_name(handler)
+        events = event_handler.run_handler(handler, store.window, {})
+        store.events[name] = len(events)
+        print(f'Recorded {name}: {len(events)} events')
+    store.save()
+    print(f'Saved {len(store.responses)} responses to {fixture_dir}')
+
+
+"""
+Replay the recorded fixtures and report handler, pipeline and API timings.
+Args:
+    event_handler (EventHandler): The event handler to benchmark.
+    handler_names (list[str] | None): The handlers to benchmark, or None for all of them.
+    fixture_dir (str): The fixture directory.
+    iterations (int): How many times each measurement is repeated.
+Returns:
+    dict: The results, keyed by measurement.
+"""
+def replay(event_handler: EventHandler, handler_names: list[str] | None, fixture_dir: str, iterations: int) -> dict:
+    store = FixtureStore.load(fixture_dir)
+    if store.window is None:
+        raise SystemExit(f'No fixtures in {fixture_dir}, run "python -m benchmarks.benchmark record" first')
+    install_adapter(ReplayAdapter(store))
+    use_recorded_window(event_handler, store.window)
+    handlers = get_handlers(event_handler, handler_names)
+
+    results = {'handlers': {}}
+    print(f'Replaying {len(store.responses)} responses recorded for {store.window}, {iterations} iterations\n')
+    print(f'{"handler":<20}{"events":>8}{"median ms":>12}{"min ms":>10}{"peak KiB":>10}{"kept KiB":>10}{"kept blocks":>13}')
+    for handler in handlers:
+        name = event_handler.get_handler_name(handler)
+        run = lambda: event_handler.run_handler(handler, store.window, {})
+        timings = measure_time(run, iterations)
+        events, peak, kept_size, kept_blocks = measure_memory(run)
+        results['handlers'][name] = {
+            'events': len(events),
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+            'peak_kib': peak / 1024,
+            'kept_kib': kept_size / 1024,
+            'kept_blocks': kept_blocks
+        }
+        result = results['handlers'][name]
+        print(f'{name:<20}{result["events"]:>8}{result["median_ms"]:>12.2f}{result["min_ms"]:>10.2f}'
+              f'{result["peak_kib"]:>10.0f}{result["kept_kib"]:>10.0f}{result["kept_blocks"]:>13}')
+
+    timings = measure_time(event_handler.get_events, iterations)
+    results['get_events'] = {'median_ms': statistics.median(timings), 'min_ms': min(timings)}
+    print(f'\nEventHandler.get_events: median {results["get_events"]["median_ms"]:.2f} ms, '
+          f'min {results["get_events"]["min_ms"]:.2f} ms')
+
+    results['api'] = measure_api(event_handler, iterations)
+    for path, result in results['api'].items():
+        print(f'GET {path}: median {result["median_ms"]:.3f} ms, p95 {result["p95_ms"]:.3f} ms')
+    return results
+
+
+"""
+Replay every fixture once and check that the harness still works.
+Args:
+    event_handler (EventHandler): The event handler to check.
+    fixture_dir (str): The fixture directory.
+Returns:
+    list[str]: A description of each problem found.
+"""
+def check(event_handler: EventHandler, fixture_dir: str) -> list[str]:
+    expected_events = FixtureStore.load(fixture_dir).events
+    results = replay(event_handler, None, fixture_dir, 1)
+    problems = []
+    for name, count in expected_events.items():
+        result = results['handlers'].get(name)
+        if result is None:
+            problems.append(f'handler {name}: not replayed')
+        elif result['events'] != count:
+            problems.append(f'handler {name}: {result["events"]} events, {count} recorded')
+    for name, result in results['api'].items():
+        if result['status'] not in (200, 304):
+            problems.append(f'GET {name}: status {result["status"]}')
+
+    # Against itself nothing regressed; against a baseline twice as fast, everything did
+    faster = json.loads(json.dumps(results))
+    for result in get_measurements(faster).values():
+        result['median_ms'] /= 2
+    if find_regressions(results, results, 0):
+        problems.append('find_regressions reported regressions against the same results')
+    if len(find_regressions(results, faster, 0.25)) != len(get_measurements(results)):
+        problems.append('find_regressions missed regressions against a faster baseline')
+    return problems
+
+
+"""
+Measure how long importing app takes in a fresh interpreter, and the memory traced while importing it.
+Import time is measured without tracemalloc, which slows imports down, and memory in one extra traced run.
+Args:
+    iterations (int): How many untraced imports to time.
+Returns:
+    dict: The import timings, traced memory, module count and heavy modules loaded.
+"""
+def measure_startup(iterations: int) -> dict:
+    timings = [run_startup_script(False)['ms'] for _ in range(max(iterations, 1))]
+    traced = run_startup_script(True)
+    results = {
+        'startup': {
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+            'traced_kib': traced['traced_kib'],
+            'peak_kib': traced['peak_kib'],
+            'modules': traced['modules'],
+            'heavy_modules': traced['heavy_modules']
+        }
+    }
+    result = results['startup']
+    print(f'import app: median {result["median_ms"]:.0f} ms, min {result["min_ms"]:.0f} ms, '
+          f'traced {result["traced_kib"] / 1024:.1f} MiB (peak {result["peak_kib"] / 1024:.1f} MiB), '
+          f'{result["modules"]} modules')
+    print(f'Heavy modules loaded: {", ".join(result["heavy_modules"]) or "none"}')
+    return results
+
+
+"""
+Import app once in a new interpreter.
+Args:
+    trace (bool): Whether to trace memory while importing.
+Returns:
+    dict: What STARTUP_SCRIPT reported.
+"""
+def run_startup_script(trace: bool) -> dict:
+    output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, 'trace' if trace else 'time', *HEAVY_MODULES],
+                            cwd=APP_DIR, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+"""
+Make the event handler fetch and display the window the fixtures were recorded for instead of today's.
+Args:
+    event_handler (EventHandler): The event handler.
+    window (TimeWindow): The recorded window.
+"""
+def use_recorded_window(event_handler: EventHandler, window: TimeWindow) -> None:
+    display_window = TimeWindow(window.start, window.start + timedelta(hours=event_handler.DISPLAY_WINDOW_HOURS))
+    event_handler.get_fetch_window = lambda: window
+    event_handler.get_display_window = lambda: display_window
+
+
+"""
+Get the location handlers to benchmark.
+Args:
+    event_handler (EventHandler): The event handler.
+    handler_names (list[str] | None): Handler class names, or None for every handler.
+Returns:
+    list: The location handlers.
+"""
+def get_handlers(event_handler: EventHandler, handler_names: list[str] | None) -> list:
+    handlers = event_handler.get_location_handlers()
+    if handler_names:
+        handlers = [handler for handler in handlers if event_handler.get_handler_name(handler) in handler_names]
+    return handlers
+
+
+"""
+Time a function, with its output suppressed.
+Args:
+    function: The function to time.
+    iterations (int): How many times to call it.
+Returns:
+    list[float]: The duration of each call in milliseconds.
+"""
+def measure_time(function, iterations: int) -> list[float]:
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+        for _ in range(iterations):
+            gc.collect()
+            started_at = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - started_at) * 1000)
+    return timings
+
+
+"""
+Trace the memory of a single call, with its output suppressed.
+Args:
+    function: The function to call.
+Returns:
+    tuple: The function's result, how far traced memory peaked above its starting size, and the size and block
+    count still held afterwards.
+"""
+def measure_memory(function) -> tuple:
+    gc.collect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = function()
+            _, peak = tracemalloc.get_traced_memory()
+            gc.collect()
+            statistics_diff = tracemalloc.take_snapshot().compare_to(before, 'filename')
+        finally:
+            tracemalloc.stop()
+    kept_size = sum(statistic.size_diff for statistic in statistics_diff)
+    kept_blocks = sum(statistic.count_diff for statistic in statistics_diff)
+    return result, peak - baseline, kept_size, kept_blocks
+
+
+"""
+Measure /api/get_events latency through Flask's test client, against a snapshot built from the fixtures.
+Args:
+    event_handler (EventHandler): The event handler, already replaying the fixtures.
+    iterations (int): How many requests to time per path.
+Returns:
+    dict: The status code and the median and 95th percentile latency in milliseconds, keyed by request.
+"""
+def measure_api(event_handler: EventHandler, iterations: int) -> dict:
+    # app starts its own refresh thread on import, which would replay today's requests next to the timed ones
+    with contextlib.redirect_stdout(io.StringIO()), mock.patch.object(RefreshScheduler, 'start'):
+        import app
+        scheduler = RefreshScheduler(event_handler)
+        scheduler.refresh_due_sources()
+        scheduler.rebuild_snapshot()
+        app.scheduler = scheduler
+    client = app.app.test_client()
+
+    etag = client.get('/api/get_events', headers={'Accept-Encoding': 'br, gzip'}).headers.get('ETag', '')
+    request_headers = {
+        '/api/get_events': {},
+        '/api/get_events (br)': {'Accept-Encoding': 'br, gzip'},
+        '/api/get_events (304)': {'Accept-Encoding': 'br, gzip', 'If-None-Match': etag},
+        '/api/get_events?type=Open%20Skate&limit=20': {'Accept-Encoding': 'gzip'},
+    }
+    results = {}
+    for name, headers in request_headers.items():
+        path = name.split(' (')[0]
+        timings = measure_time(lambda: client.get(path, headers=headers), max(iterations, 20))
+        timings.sort()
+        results[name] = {
+            'status': client.get(path, headers=headers).status_code,
+            'median_ms': statistics.median(timings),
+            'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        }
+    return results
+
+
+"""
+Compare median timings against a saved baseline.
+Args:
+    results (dict): The results of this run.
+    baseline (dict): The results of a previous run.
+    tolerance (float): The allowed slowdown, as a fraction of the baseline.
+Returns:
+    list[str]: A description of each measurement that regressed.
+"""
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    measurements = get_measurements(results)
+    baseline_measurements = get_measurements(baseline)
+    regressions = []
+    for name, result in measurements.items():
+        baseline_result = baseline_measurements.get(name)
+        if baseline_result and result['median_ms'] > baseline_result['median_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: {baseline_result["median_ms"]:.2f} ms -> {result["median_ms"]:.2f} ms')
+    return regressions
+
+
+"""
+Flatten the timed measurements of a replay or startup run.
+Args:
+    results (dict): The results of a run.
+Returns:
+    dict[str, dict]: Each measurement that has a median time, keyed by a readable name.
+"""
+def get_measurements(results: dict) -> dict[str, dict]:
+    measurements = {f'handler {name}': result for name, result in results.get('handlers', {}).items()}
+    if 'get_events' in results:
+        measurements['EventHandler.get_events'] = results['get_events']
+    for name, result in results.get('api', {}).items():
+        measurements[f'GET {name}'] = result
+    if 'startup' in results:
+        measurements['import app'] = results['startup']
+    return measurements
+
+
+"""
+Save the results and compare them to a baseline, as asked on the command line.
+Exits with status 1 when a measurement regressed.
+Args:
+    results (dict): The results of this run.
+    args (argparse.Namespace): The parsed command line.
+"""
+def save_and_compare(results: dict, args: argparse.Namespace) -> None:
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as results_file:
+            json.dump(results, results_file, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Record or replay location handler responses and benchmark them.')
+    parser.add_argument('mode', choices=['record', 'replay', 'check', 'startup'])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR, help='The fixture directory.')
+    parser.add_argument('--handlers', nargs='*', help='Handler class names to include. Defaults to all of them.')
+    parser.add_argument('--iterations', type=int, default=10, help='How many times each measurement is repeated.')
+    parser.add_argument('--save', help='Write the replay or startup results to this JSON file.')
+    parser.add_argument('--compare', help='Compare the replay or startup results to this JSON file.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='The allowed slowdown against --compare.')
+    args = parser.parse_args()
+
+    if args.mode == 'startup':
+        save_and_compare(measure_startup(args.iterations), args)
+        return
+
+    os.environ['TZ'] = FIXTURE_TIMEZONE
+    time.tzset()
+    with contextlib.redirect_stdout(io.StringIO()):
+        event_handler = EventHandler()
+    if args.mode == 'record':
+        record(event_handler, args.handlers, args.fixtures)
+        return
+    if args.mode == 'check':
+        problems = check(event_handler, args.fixtures)
+        for problem in problems:
+            print(f'Check failed: {problem}')
+        if problems:
+            sys.exit(1)
+        print('\nCheck passed')
+        return
+
+    save_and_compare(replay(event_handler, args.handlers, args.fixtures, args.iterations), args)
+
+
+if __name__ == '__main__':
+    main()
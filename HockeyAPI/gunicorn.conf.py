@@ -0,0 +1,30 @@
+import os
+import shutil
+
+"""
+Gunicorn hooks, loaded from the working directory on top of the command line in the Dockerfile.
+They keep the Prometheus multiprocess directory (PROMETHEUS_MULTIPROC_DIR) in step with the running workers.
+"""
+
+
+"""
+Empty the Prometheus multiprocess directory before any worker starts, so metrics of a previous run are not reported.
+Args:
+    server (gunicorn.arbiter.Arbiter): The gunicorn master.
+"""
+def on_starting(server) -> None:
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+"""
+Drop the live gauges of a worker that exited, such as its connected stream clients.
+Args:
+    server (gunicorn.arbiter.Arbiter): The gunicorn master.
+    worker (gunicorn.workers.base.Worker): The worker that exited.
+"""
+def child_exit(server, worker) -> None:
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,205 @@
+import json
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from enums.Event_Type import EventType
+from models.Arena import Arena
+from models.Cost import Cost
+from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+from utils.Web_Utils import post_body
+from utils.Metrics import record_parse_error
+
+
+class ActiveCommunitiesHandler:
+    """
+    Fetches events from an ActiveCommunities (ActiveNet) online calendar, via its multicenter events endpoint.
+    The fetch window is searched in bounded chunks of search_days days, and every page of each chunk is read from
+    every center. All requests go through the shared Web_Utils session, so they reuse its pooled connections to the
+    ActiveCommunities host.
+    Each event's rink is its first facility's name, which is used as the notes of the event's arena. Centers can have
+    their own arena, keyed by center ID in the source's arenas, and otherwise share the default arena.
+    Options:
+        calendar_id (int): The online calendar to search.
+        center_ids (list[int]): The centers to search.
+        event_type_ids (list[int], optional): Only return calendar events of these types. Defaults to all types.
+        events (list[dict]): Which calendar events to keep, in order: the first whose "title" is part of the
+        event's title gives its "event_type" name and the key of its "cost".
+        include_description (bool, optional): Whether to add the event's description to its notes. Defaults to False.
+        search_days (int, optional): The number of days searched per request. Defaults to 7.
+        page_size (int, optional): The number of events requested per page. Defaults to 200.
+    """
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+    DATE_FORMAT = "%Y-%m-%d"
+    MAX_PAGES = 50
+
+    def __init__(self, config: SourceConfig):
+        self.name = config.name
+        self.url = config.url
+        self.arena = config.get_arena()
+        self.center_arenas = config.arenas
+        self.calendar_id = config.get_option('calendar_id')
+        self.center_ids = config.get_option('center_ids', [])
+        self.event_type_ids = config.get_option('event_type_ids', [])
+        self.include_description = config.get_option('include_description', False)
+        self.search_days = config.get_option('search_days', 7)
+        self.page_size = config.get_option('page_size', 200)
+        self.event_matches: list[tuple[str, EventType, Cost]] = [
+            (match['title'], EventType[match['event_type']], config.get_cost(match['cost']))
+            for match in config.get_option('events', [])
+        ]
+
+    """
+    Fetches the matching calendar events in the window.
+    If any chunk or page can't be fetched or read, no events are returned, so the last good result is kept instead of
+    one that silently lacks part of the window.
+    Args:
+        window (TimeWindow): The window to fetch events for.
+    Returns:
+        list[Event]: A list of Event objects representing the fetched events.
+    """
+    def get_events(self, window: TimeWindow) -> list[Event]:
+        print(f'Fetching {self.name} events...')
+        events = []
+        window_start = window.start.strftime(self.TIME_FORMAT)
+        window_end = window.end.strftime(self.TIME_FORMAT)
+
+        try:
+            for center_id, json_event in self.iter_calendar_events(window):
+                if not window_start <= json_event['start_time'] <= window_end:
+                    continue
+                event = self.create_event(center_id, json_event)
+                if event is not None:
+                    events.append(event)
+        except Exception as e:
+            print(f'Error fetching {self.name} events, discarding {len(events)} events already read: {e}')
+            record_parse_error()
+            return []
+
+        # An event that crosses midnight between two search chunks is returned by both
+        return list(dict.fromkeys(events))
+
+    """
+    Read the calendar events of every center, one search chunk and page at a time.
+    Args:
+        window (TimeWindow): The window to search.
+    Returns:
+        Iterator[tuple[str, dict]]: Each calendar event, with the ID of its center.
+    """
+    def iter_calendar_events(self, window: TimeWindow) -> Iterator[tuple[str, dict]]:
+        for search_start, search_end in self.get_search_chunks(window):
+            page_number = 1
+            while True:
+                json_response = self.fetch_page(search_start, search_end, page_number)
+                for center in json_response['body']['center_events']:
+                    center_id = str(center.get('center_id', ''))
+                    for json_event in center.get('events') or []:
+                        yield center_id, json_event
+
+                total_pages = self.get_total_pages(json_response)
+                if page_number >= min(total_pages, self.MAX_PAGES):
+                    break
+                page_number += 1
+
+    """
+    Split the window into the day ranges searched by each request.
+    Args:
+        window (TimeWindow): The window to search.
+    Returns:
+        list[tuple[datetime, datetime]]: The first and last day of each chunk, without overlaps.
+    """
+    def get_search_chunks(self, window: TimeWindow) -> list[tuple[datetime, datetime]]:
+        chunks = []
+        # A window ending at midnight doesn't need the search to cover the day it ends on
+        last_day = max(window.end - timedelta(microseconds=1), window.start)
+        last_day = last_day.replace(hour=0, minute=0, second=0, microsecond=0)
+        chunk_start = window.start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while chunk_start <= last_day:
+            chunk_end = min(chunk_start + timedelta(days=max(self.search_days, 1) - 1), last_day)
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end + timedelta(days=1)
+        return chunks
+
+    """
+    Fetch one page of a search chunk.
+    Args:
+        search_start (datetime): The first day to search.
+        search_end (datetime): The last day to search.
+        page_number (int): The page to fetch, starting at 1.
+    Returns:
+        dict: The decoded response.
+    """
+    def fetch_page(self, search_start: datetime, search_end: datetime, page_number: int) -> dict:
+        request_body = {
+            "calendar_id": self.calendar_id,
+            "center_ids": self.center_ids,
+            "display_all": 0,
+            "search_start_time": search_start.strftime(self.DATE_FORMAT),
+            "search_end_time": search_end.strftime(self.DATE_FORMAT),
+            "facility_ids": [],
+            "activity_category_ids": [],
+            "activity_sub_category_ids": [],
+            "activity_ids": [],
+            "activity_min_age": None,
+            "activity_max_age": None,
+            "event_type_ids": self.event_type_ids
+        }
+        page_info = {"order_by": "", "page_number": page_number, "total_records_per_page": self.page_size}
+        response = post_body(self.url, json.dumps(request_body), headers={'page_info': json.dumps(page_info)})
+        return json.loads(response)
+
+    """
+    Get the number of pages a search has, from the response's paging header.
+    Args:
+        json_response (dict): The decoded response.
+    Returns:
+        int: The total number of pages, or 1 if the response isn't paged.
+    """
+    @staticmethod
+    def get_total_pages(json_response: dict) -> int:
+        page_info = (json_response.get('headers') or {}).get('page_info') or {}
+        try:
+            return max(int(page_info.get('total_page', 1)), 1)
+        except (TypeError, ValueError):
+            return 1
+
+    """
+    Create an Event from a calendar event, if it is one of the configured events.
+    Args:
+        center_id (str): The ID of the event's center.
+        json_event (dict): The calendar event.
+    Returns:
+        Event | None: The event, or None if its title doesn't match any configured event.
+    """
+    def create_event(self, center_id: str, json_event: dict) -> Event | None:
+        event_name = json_event['title']
+        for title, event_type, cost in self.event_matches:
+            if title in event_name:
+                break
+        else:
+            return None
+
+        rink_name = json_event['facilities'][0]['facility_name'] if json_event.get('facilities') else ""
+        notes = rink_name
+        event_description = json_event.get('description') or ""
+        if self.include_description and event_description != "":
+            notes += f" - {event_description}"
+
+        return Event(
+            event_type=event_type,
+            arena=self.get_arena(center_id).with_notes(rink_name),
+            start_time=datetime.strptime(json_event['start_time'], self.TIME_FORMAT),
+            end_time=datetime.strptime(json_event['end_time'], self.TIME_FORMAT),
+            cost=cost,
+            notes=notes
+        )
+
+    """
+    Get the arena of a center.
+    Args:
+        center_id (str): The center ID.
+    Returns:
+        Arena: The center's arena, or the default arena if the center doesn't have its own.
+    """
+    def get_arena(self, center_id: str) -> Arena:
+        return self.center_arenas.get(center_id, self.arena)
@@ -0,0 +1,127 @@
+import threading
+from collections import deque
+from itertools import islice
+from handlers.Event_Handler import EventHandler
+from models.Event import Event
+from models.TimeWindow import TimeWindow
+
+"""
+Diffs of each source's events between refreshes, served by /api/changes.
+Events are identified by their hash, so an event whose cost, end time or notes changed is a different event. A
+removed and an added event of the same source at the same arena and rink, of the same type and starting at the same
+time are reported together as one changed event. Only events starting in the part of the fetch window both results
+cover are diffed, so days that moved out of or into the window as it moved on are not reported as changes.
+Each change is a JSON-ready dict with the source name, the change ('added', 'removed' or 'changed'), the event, and
+for changed events the previous event. Changes get consecutive versions when they are recorded.
+"""
+
+
+"""
+Diff a source's previous events against its latest ones.
+Args:
+    name (str): The source name.
+    previous_events (list[Event]): The events the source returned before.
+    events (list[Event]): The events the source returned now.
+    window (TimeWindow, optional): Only diff events starting in this window. Defaults to every event.
+Returns:
+    list[dict]: The changes, removed and changed events first, each group ordered by start time.
+"""
+def diff_source_events(name: str, previous_events: list[Event], events: list[Event],
+                       window: TimeWindow | None = None) -> list[dict]:
+    if window is not None:
+        previous_events = [event for event in previous_events if window.contains(event.start_time)]
+        events = [event for event in events if window.contains(event.start_time)]
+    previous_set = set(previous_events)
+    current_set = set(events)
+    removed = sorted(previous_set - current_set)
+    added = sorted(current_set - previous_set)
+    if not removed and not added:
+        return []
+
+    added_by_slot: dict[tuple, list[Event]] = {}
+    for event in added:
+        added_by_slot.setdefault(get_event_slot(event), []).append(event)
+
+    changes = []
+    changed = set()
+    for event in removed:
+        replacements = added_by_slot.get(get_event_slot(event))
+        if replacements:
+            replacement = replacements.pop(0)
+            changed.add(replacement)
+            changes.append(create_change(name, 'changed', replacement, event))
+        else:
+            changes.append(create_change(name, 'removed', event))
+    changes.extend(create_change(name, 'added', event) for event in added if event not in changed)
+    return changes
+
+"""
+Get what identifies an event across refreshes when its other details change.
+Args:
+    event (Event): The event.
+Returns:
+    tuple: The event's arena, rink, type and start time.
+"""
+def get_event_slot(event: Event) -> tuple:
+    return event.arena.name, event.arena.notes, event.event_type, event.start_time
+
+"""
+Create a JSON-ready change.
+Args:
+    name (str): The source name.
+    change (str): 'added', 'removed' or 'changed'.
+    event (Event): The event, or for removed events the event that was removed.
+    previous (Event, optional): The event a changed event replaces.
+Returns:
+    dict: The change.
+"""
+def create_change(name: str, change: str, event: Event, previous: Event | None = None) -> dict:
+    serialized = EventHandler.serialize_events([event] if previous is None else [event, previous])
+    return {
+        "source": name,
+        "change": change,
+        "event": serialized[0],
+        "previous": serialized[1] if previous is not None else None
+    }
+
+
+class ChangeFeed:
+    """
+    Keeps the latest MAX_CHANGES changes in memory, for when there is no SnapshotStore to keep them.
+    Versions restart at 1 with the process; a client that asks for changes since a version this feed never reached,
+    or since one it no longer keeps, is told to reset and load every event again.
+    """
+
+    def __init__(self, max_changes: int = 10000):
+        self.MAX_CHANGES = max_changes
+        self.version = 0
+        self._changes: deque[dict] = deque(maxlen=max_changes)
+        self._lock = threading.Lock()
+
+    """
+    Record changes, giving each the next version.
+    Args:
+        changes (list[dict]): The changes.
+    """
+    def record(self, changes: list[dict]) -> None:
+        with self._lock:
+            for change in changes:
+                self.version += 1
+                self._changes.append(dict(change, version=self.version))
+
+    """
+    Get the changes recorded after a version.
+    Args:
+        since (int): The last version the client has seen.
+        limit (int): The maximum number of changes to return.
+    Returns:
+        tuple[list[dict], int, bool]: The changes in version order, the latest version, and True if the client must
+        reset because the changes since its version are not all available.
+    """
+    def get_changes(self, since: int, limit: int) -> tuple[list[dict], int, bool]:
+        with self._lock:
+            oldest_version = self._changes[0]['version'] if self._changes else self.version + 1
+            if since > self.version or since < oldest_version - 1:
+                return [], self.version, True
+            skip = since - oldest_version + 1
+            return list(islice(self._changes, skip, skip + limit)), self.version, False
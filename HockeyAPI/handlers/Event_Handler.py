@@ -1,100 +1,225 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 from models.Event import Event
-from location_handlers.AppleValley import AppleValley
-from location_handlers.Bloomington import Bloomington
-from location_handlers.Burnsville import Burnsville
-from location_handlers.Eagan import Eagan
-from location_handlers.Edina import Edina
-from location_handlers.Farmington import Farmington
-from location_handlers.InverGroveHeights import InverGroveHeights
-from location_handlers.Lakeville import Lakeville
-from location_handlers.PriorLake import PriorLake
-from location_handlers.Richfield import Richfield
-from location_handlers.Rosemount import Rosemount
-from location_handlers.Shakopee import Skakopee
-from location_handlers.SouthStPaul import SouthStPaul
+from models.TimeWindow import TimeWindow
+from handlers.Handler_Registry import create_location_handlers
+from utils.Metrics import record_handler_error, record_handler_events, track_handler_run
 
 class EventHandler:
     """
     Handles event processing including filtering, sorting, and removing duplicates.
     """
 
-    def __init__(self):
-        self.apple_valley_handler = AppleValley()
-        self.bloomington_handler = Bloomington()
-        self.burnsville_handler = Burnsville()
-        self.eagan_handler = Eagan()
-        self.edina_handler = Edina()
-        self.farmington_handler = Farmington()
-        self.inver_grove_heights_handler = InverGroveHeights()
-        self.lakeville_handler = Lakeville()
-        self.prior_lake_handler = PriorLake()
-        self.richfield_handler = Richfield()
-        self.rosemount_handler = Rosemount()
-        self.shakopee_handler = Skakopee()
-        self.south_st_paul_handler = SouthStPaul()
-
-    def get_events(self) -> list[Event]:
-        events = self.get_location_events()
+    def __init__(self, max_workers: int = 16, handler_timeout_seconds: float = 60,
+                 request_deadline_seconds: float = 120, fetch_window_days: int = 14,
+                 display_window_hours: int = 48):
+        self.MAX_WORKERS = max_workers
+        self.HANDLER_TIMEOUT_SECONDS = handler_timeout_seconds
+        self.REQUEST_DEADLINE_SECONDS = request_deadline_seconds
+        self.FETCH_WINDOW_DAYS = fetch_window_days
+        self.DISPLAY_WINDOW_HOURS = display_window_hours
+
+        # Handlers are imported the first time they are fetched, see handlers/Handler_Registry.py
+        self.location_handlers = create_location_handlers()
+
+    """
+    Fetch events from every location handler and prepare them for the API response.
+    Returns:
+        list[dict]: The filtered, de-duplicated and ordered events as JSON-ready dictionaries.
+    """
+    def get_events(self) -> list[dict]:
+        return self.prepare_events(self.get_location_events())
+
+    """
+    Filter, de-duplicate, order and serialize already fetched events.
+    Args:
+        events (list[Event]): The events fetched from the location handlers.
+    Returns:
+        list[dict]: The events as JSON-ready dictionaries.
+    """
+    def prepare_events(self, events: list[Event]) -> list[dict]:
         print(f'Total events fetched: {len(events)}')
         filtered_events = self.filter_events_next_24_hours(events)
         non_duplicate_events = self.remove_duplicates(filtered_events)
         print(f'Total events after filtering: {len(non_duplicate_events)}')
         ordered_events = self.sort_events(non_duplicate_events)
+        return self.serialize_events(ordered_events)
 
-        if ordered_events:
-            events_json = []
-            for event in ordered_events:
-                event_data = {
-                    "arena": {
-                        "name": event.arena.name,
-                        "address": {
-                            "street": event.arena.address.street,
-                            "city": event.arena.address.city,
-                            "state": event.arena.address.state,
-                            "zip_code": event.arena.address.zip_code
-                        },
-                        "notes": event.arena.notes
+    """
+    Serialize already filtered and ordered events.
+    Args:
+        events (list[Event]): The events, in the order they should be returned.
+    Returns:
+        list[dict]: The events as JSON-ready dictionaries.
+    """
+    @staticmethod
+    def serialize_events(events: list[Event]) -> list[dict]:
+        events_json = []
+        for event in events:
+            event_data = {
+                "arena": {
+                    "name": event.arena.name,
+                    "address": {
+                        "street": event.arena.address.street,
+                        "city": event.arena.address.city,
+                        "state": event.arena.address.state,
+                        "zip_code": event.arena.address.zip_code
                     },
-                    "event_type": event.event_type.value,
-                    "start_time": event.start_time.strftime("%Y-%m-%d %H:%M"),
-                    "end_time": event.end_time.strftime("%Y-%m-%d %H:%M"),
-                    "notes": event.notes,
-                    "cost": {
-                        "cost": event.cost.get_cost()
-                    }
+                    "notes": event.arena.notes
+                },
+                "event_type": event.event_type.value,
+                "start_time": event.start_time.strftime("%Y-%m-%d %H:%M"),
+                "end_time": event.end_time.strftime("%Y-%m-%d %H:%M"),
+                "notes": event.notes,
+                "cost": {
+                    "cost": event.cost.get_cost()
                 }
-                events_json.append(event_data)
-            return events_json
-        else:
-            return []
+            }
+            events_json.append(event_data)
+        return events_json
+
+    """
+    Get every location handler that contributes events.
+    Returns:
+        list: The location handler instances.
+    """
+    def get_location_handlers(self) -> list:
+        return list(self.location_handlers)
+
+    """
+    Get the window of time location handlers fetch events for: from midnight today, FETCH_WINDOW_DAYS ahead.
+    Returns:
+        TimeWindow: The fetch window.
+    """
+    def get_fetch_window(self) -> TimeWindow:
+        return TimeWindow.from_today(self.FETCH_WINDOW_DAYS)
+
+    """
+    Get the fetch window of a refresh that ran at a given time.
+    Args:
+        fetched_at (datetime): When the refresh ran.
+    Returns:
+        TimeWindow: The window location handlers fetched events for then.
+    """
+    def get_fetch_window_at(self, fetched_at: datetime) -> TimeWindow:
+        return TimeWindow.from_day(fetched_at, self.FETCH_WINDOW_DAYS)
+
+    """
+    Get the window of time the API returns events for by default: from now, DISPLAY_WINDOW_HOURS ahead.
+    Returns:
+        TimeWindow: The display window.
+    """
+    def get_display_window(self) -> TimeWindow:
+        now = datetime.now()
+        return TimeWindow(now, now + timedelta(hours=self.DISPLAY_WINDOW_HOURS))
 
-    def get_location_events(self) -> list[Event]:
+    """
+    Fetch events from every location handler concurrently.
+    Args:
+        window (TimeWindow, optional): The window to fetch events for. Defaults to the fetch window.
+    Returns:
+        list[Event]: The combined events of every handler that finished in time.
+    """
+    def get_location_events(self, window: TimeWindow | None = None) -> list[Event]:
         events = []
-        events.extend(self.apple_valley_handler.get_events())
-        events.extend(self.bloomington_handler.get_events())
-        events.extend(self.burnsville_handler.get_events())
-        events.extend(self.eagan_handler.get_events())
-        events.extend(self.edina_handler.get_events())
-        events.extend(self.farmington_handler.get_events())
-        events.extend(self.inver_grove_heights_handler.get_events())
-        events.extend(self.lakeville_handler.get_events())
-        events.extend(self.prior_lake_handler.get_events())
-        events.extend(self.richfield_handler.get_events())
-        events.extend(self.rosemount_handler.get_events())
-        events.extend(self.shakopee_handler.get_events())
-        events.extend(self.south_st_paul_handler.get_events())
+        for handler_events in self.collect_location_events(self.get_location_handlers(), window).values():
+            events.extend(handler_events)
 
         return events
 
+    """
+    Run the given location handlers on a bounded thread pool.
+    A handler that runs longer than HANDLER_TIMEOUT_SECONDS, or is still running when the
+    REQUEST_DEADLINE_SECONDS deadline passes, is left behind so the others can still be returned.
+    Args:
+        handlers (list): The location handlers to run.
+        window (TimeWindow, optional): The window to fetch events for. Defaults to the fetch window.
+    Returns:
+        dict[str, list[Event]]: The events of each handler that finished in time, keyed by handler name.
+    """
+    def collect_location_events(self, handlers: list, window: TimeWindow | None = None) -> dict[str, list[Event]]:
+        results = {}
+        if not handlers:
+            return results
+
+        window = window if window is not None else self.get_fetch_window()
+        deadline = time.monotonic() + self.REQUEST_DEADLINE_SECONDS
+        started_at = {}
+        executor = ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(handlers)),
+                                      thread_name_prefix='location-handler')
+        try:
+            pending = {executor.submit(self.run_handler, handler, window, started_at): handler for handler in handlers}
+            while pending:
+                now = time.monotonic()
+                expired = [future for future, handler in pending.items()
+                           if handler in started_at and now - started_at[handler] >= self.HANDLER_TIMEOUT_SECONDS]
+                for future in expired:
+                    name = self.get_handler_name(pending.pop(future))
+                    print(f'Timed out fetching {name} events')
+                    record_handler_error(name, 'timeout')
+                if not pending or now >= deadline:
+                    break
+
+                timeout = deadline - now
+                running = [started_at[handler] for handler in pending.values() if handler in started_at]
+                if running:
+                    timeout = min(timeout, min(running) + self.HANDLER_TIMEOUT_SECONDS - now)
+
+                done, _ = wait(pending, timeout=max(timeout, 0), return_when=FIRST_COMPLETED)
+                for future in done:
+                    handler = pending.pop(future)
+                    results[self.get_handler_name(handler)] = future.result()
+
+            for handler in pending.values():
+                name = self.get_handler_name(handler)
+                print(f'Deadline passed before {name} events were fetched')
+                record_handler_error(name, 'deadline')
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    """
+    Run a single location handler, recording when it started so its timeout can be enforced.
+    The run's HTTP and parse time, event count and errors are recorded in the handler metrics.
+    Args:
+        handler: The location handler to run.
+        window (TimeWindow): The window to fetch events for.
+        started_at (dict): Start times of the running handlers, keyed by handler.
+    Returns:
+        list[Event]: The events returned by the handler, or an empty list if it raised.
+    """
+    def run_handler(self, handler, window: TimeWindow, started_at: dict) -> list[Event]:
+        started_at[handler] = time.monotonic()
+        name = self.get_handler_name(handler)
+        try:
+            with track_handler_run(name) as run:
+                events = handler.get_events(window)
+                record_handler_events(run, len(events))
+                return events
+        except Exception as e:
+            print(f'Error fetching {name} events: {e}')
+            return []
+
+    """
+    Get a readable name for a location handler.
+    Args:
+        handler: The location handler.
+    Returns:
+        str: The handler's registered name, or its class name if it isn't registered.
+    """
+    @staticmethod
+    def get_handler_name(handler) -> str:
+        return getattr(handler, 'NAME', None) or type(handler).__name__
+
     """
     Filter events by date range (optional) - next 24 hours
     """
 
     def filter_events_next_24_hours(self, events: list[Event]) -> list[Event]:
-        now = datetime.now()
-        next_24_hours = now + timedelta(hours=48)
-        return self.filter_events_by_date_range(events, now, next_24_hours)
+        display_window = self.get_display_window()
+        return self.filter_events_by_date_range(events, display_window.start, display_window.end)
 
     """
     Filter events by date range
@@ -116,7 +241,7 @@ class EventHandler:
 
     @staticmethod
     def sort_events(events: list[Event]) -> list[Event]:
-        return sorted(events, key=lambda event: event)
+        return sorted(events, key=lambda event: event.sort_key)
 
     """
     Remove duplicate events
@@ -0,0 +1,171 @@
+import threading
+from bisect import bisect_left, bisect_right
+from enums.Event_Type import EventType
+from models.Event import Event
+from models.TimeWindow import TimeWindow
+
+
+class EventStore:
+    """
+    Holds the aggregated events of every location handler sorted by start time, with case-insensitive indexes by
+    city and arena name and an index by event type. Each handler's events are replaced incrementally, so a refresh
+    only inserts and removes the events that changed, and queries use bisection on the start times and index lookups
+    instead of rescanning.
+    Events are identified and ordered by the key returned by get_event_key.
+    """
+
+    def __init__(self):
+        self.version = 0
+
+        self._lock = threading.RLock()
+        self._start_times: list = []
+        self._event_keys: list[tuple] = []
+        self._events: dict[tuple, Event] = {}
+        self._event_counts: dict[tuple, int] = {}
+        self._source_event_keys: dict[str, set[tuple]] = {}
+        self._keys_by_city: dict[str, set[tuple]] = {}
+        self._keys_by_arena: dict[str, set[tuple]] = {}
+        self._keys_by_event_type: dict[EventType, set[tuple]] = {}
+
+    """
+    Replace the events of a location handler with its latest result.
+    Only the events that were added or removed since the previous result touch the sorted list and indexes.
+    Args:
+        name (str): The handler name.
+        events (list[Event]): The handler's latest events.
+    Returns:
+        bool: True if the stored events changed.
+    """
+    def replace_source(self, name: str, events: list[Event]) -> bool:
+        new_events = {self.get_event_key(event): event for event in events}
+        with self._lock:
+            old_keys = self._source_event_keys.get(name, set())
+            new_keys = set(new_events)
+            removed_keys = old_keys - new_keys
+            added_keys = new_keys - old_keys
+            if not removed_keys and not added_keys:
+                return False
+
+            for key in removed_keys:
+                self._remove(key)
+            for key in added_keys:
+                self._add(key, new_events[key])
+            self._source_event_keys[name] = new_keys
+            self.version += 1
+            return True
+
+    """
+    Query the stored events in start time order.
+    Args:
+        window (TimeWindow, optional): Only return events that start inside this window.
+        city (str, optional): Only return events in this city, ignoring case.
+        arena (str, optional): Only return events at the arena with this name, ignoring case.
+        event_type (EventType, optional): Only return events of this type.
+        limit (int, optional): Return at most this many events.
+    Returns:
+        list[Event]: The matching events, ordered by start time, arena and event type.
+    """
+    def query(self, window: TimeWindow | None = None, city: str | None = None, arena: str | None = None,
+              event_type: EventType | None = None, limit: int | None = None) -> list[Event]:
+        with self._lock:
+            low = 0
+            high = len(self._start_times)
+            if window is not None:
+                low = bisect_left(self._start_times, window.start)
+                high = bisect_right(self._start_times, window.end)
+
+            index_filters = []
+            if city is not None:
+                index_filters.append(self._keys_by_city.get(city.casefold(), set()))
+            if arena is not None:
+                index_filters.append(self._keys_by_arena.get(arena.casefold(), set()))
+            if event_type is not None:
+                index_filters.append(self._keys_by_event_type.get(event_type, set()))
+
+            if not index_filters:
+                keys = self._event_keys[low:high]
+            else:
+                allowed_keys = set.intersection(*sorted(index_filters, key=len))
+                if len(allowed_keys) < high - low:
+                    keys = [key for key in sorted(allowed_keys) if window is None or window.contains(key[0])]
+                else:
+                    keys = [key for key in self._event_keys[low:high] if key in allowed_keys]
+
+            if limit is not None:
+                keys = keys[:limit]
+            return [self._events[key] for key in keys]
+
+    """
+    Get the number of distinct events stored.
+    Returns:
+        int: The number of events.
+    """
+    def __len__(self) -> int:
+        return len(self._event_keys)
+
+    """
+    Internal function to insert an event, counting it once per handler that returned it.
+    Args:
+        key (tuple): The event key.
+        event (Event): The event.
+    """
+    def _add(self, key: tuple, event: Event) -> None:
+        count = self._event_counts.get(key, 0)
+        self._event_counts[key] = count + 1
+        if count:
+            return
+
+        position = bisect_right(self._event_keys, key)
+        self._event_keys.insert(position, key)
+        self._start_times.insert(position, event.start_time)
+        self._events[key] = event
+        self._keys_by_city.setdefault(event.arena.get_city_name().casefold(), set()).add(key)
+        self._keys_by_arena.setdefault(event.arena.name.casefold(), set()).add(key)
+        self._keys_by_event_type.setdefault(event.event_type, set()).add(key)
+
+    """
+    Internal function to remove an event once no handler returns it anymore.
+    Args:
+        key (tuple): The event key.
+    """
+    def _remove(self, key: tuple) -> None:
+        count = self._event_counts.get(key, 0) - 1
+        if count > 0:
+            self._event_counts[key] = count
+            return
+
+        self._event_counts.pop(key, None)
+        event = self._events.pop(key)
+        position = bisect_left(self._event_keys, key)
+        del self._event_keys[position]
+        del self._start_times[position]
+        self._discard_from_index(self._keys_by_city, event.arena.get_city_name().casefold(), key)
+        self._discard_from_index(self._keys_by_arena, event.arena.name.casefold(), key)
+        self._discard_from_index(self._keys_by_event_type, event.event_type, key)
+
+    """
+    Internal function to remove an event key from an index, dropping the index entry once it is empty.
+    Args:
+        index (dict): The index.
+        value: The indexed value.
+        key (tuple): The event key.
+    """
+    @staticmethod
+    def _discard_from_index(index: dict, value, key: tuple) -> None:
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[value]
+
+    """
+    Get the key that identifies an event. It is the event's precomputed sort key, so keys sort in the same order
+    EventHandler sorts events in.
+    Args:
+        event (Event): The event.
+    Returns:
+        tuple: The event key.
+    """
+    @staticmethod
+    def get_event_key(event: Event) -> tuple:
+        return event.sort_key
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import os
+import socket
+import threading
+from urllib.parse import parse_qs, urlsplit
+from handlers.Refresh_Scheduler import RefreshScheduler
+from utils.Metrics import set_stream_clients
+
+EVENT_STREAM_PORT = os.environ.get('EVENT_STREAM_PORT', '8081')
+STREAM_PATH = '/api/stream'
+CHANGES_PAGE_SIZE = 1000
+REQUEST_TIMEOUT_SECONDS = 10
+RETRY_MILLISECONDS = 5000
+# A client that lets this much go unread is too slow to keep up and is disconnected
+MAX_BUFFERED_BYTES = 1024 * 1024
+
+
+class StreamClient:
+    """
+    A connected Server-Sent Events client.
+    Attributes:
+        writer (asyncio.StreamWriter): The client's connection.
+        version (int): The latest change version sent to the client.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, version: int):
+        self.writer = writer
+        self.version = version
+
+
+class EventStream:
+    """
+    Pushes schedule updates to browsers and other clients as Server-Sent Events on STREAM_PATH.
+    Idle connections must not hold one of gunicorn's worker threads each, so the stream is served on its own port by
+    an asyncio event loop in a daemon thread, where hundreds of open connections cost a socket and a few objects each.
+    The port is bound with SO_REUSEPORT, so every gunicorn worker serves it and the kernel spreads connections between
+    them.
+    Three events are sent:
+        snapshot: The aggregated snapshot changed; its data holds the new digest and build time. One is sent on
+        connect, so a reconnecting client can tell whether it missed one.
+        changes: A page of changes from /api/changes, with the last change's version as the event ID. A client that
+        reconnects with a Last-Event-ID header, or connects with ?since=<version>, first gets the changes it missed,
+        or a reset event if they are no longer kept.
+        reset: The changes after the client's version are no longer kept; the client should load /api/get_events
+        again. Its ID is the version to continue from.
+    """
+
+    def __init__(self, scheduler: RefreshScheduler, host: str = '0.0.0.0', port: int = int(EVENT_STREAM_PORT or 8081),
+                 keepalive_seconds: float = 15, max_clients: int = 1000):
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.KEEPALIVE_SECONDS = keepalive_seconds
+        self.MAX_CLIENTS = max_clients
+
+        self.clients: set[StreamClient] = set()
+        self._version = 0
+        self._digest: str | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    """
+    Start serving the stream in a background thread and publish the scheduler's updates to it. Calling it again is
+    a no-op.
+    """
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._digest = self.scheduler.snapshot_payload.digest
+            result = self.scheduler.get_changes(0, 0)
+            if result is not None:
+                _, self._version, _ = result
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.run, name='event-stream', daemon=True)
+            self._thread.start()
+            self.scheduler.add_listener(self.publish_updates)
+
+    """
+    Run the event loop serving the stream until the process exits.
+    """
+    def run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self.serve())
+        except Exception as e:
+            print(f'Error serving the event stream on port {self.port}: {e}')
+
+    """
+    Listen for clients and send them keepalive comments, so proxies don't close idle connections.
+    """
+    async def serve(self) -> None:
+        server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                            reuse_port=hasattr(socket, 'SO_REUSEPORT'))
+        print(f'Serving the event stream on port {self.port}')
+        async with server:
+            while True:
+                await asyncio.sleep(self.KEEPALIVE_SECONDS)
+                self.broadcast(b': keepalive\n\n')
+
+    """
+    Publish the snapshot and changes the scheduler built since the last call. Called from the refresh thread.
+    """
+    def publish_updates(self) -> None:
+        payload = self.scheduler.snapshot_payload
+        if payload.digest != self._digest:
+            self._digest = payload.digest
+            self.publish(self.format_snapshot(), 0)
+
+        more = True
+        while more:
+            result = self.scheduler.get_changes(self._version, CHANGES_PAGE_SIZE)
+            if result is None:
+                return
+            changes, latest_version, reset = result
+            if reset:
+                self._version = latest_version
+                self.publish(self.format_message('reset', {"version": latest_version}, latest_version),
+                             latest_version)
+                return
+            if not changes:
+                return
+            self._version = changes[-1]['version']
+            more = self._version < latest_version
+            self.publish(self.format_changes(changes, latest_version), self._version)
+
+    """
+    Send a message to every client from the event loop thread.
+    Args:
+        message (bytes): The encoded message.
+        version (int): The change version the message brings clients to, or 0 if it carries no changes.
+    """
+    def publish(self, message: bytes, version: int) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.broadcast, message, version)
+
+    """
+    Send a message to every client, skipping the ones that already got its changes, and disconnecting the ones that
+    stopped reading. Runs on the event loop thread.
+    Args:
+        message (bytes): The encoded message.
+        version (int, optional): The change version the message brings clients to. Defaults to none.
+    """
+    def broadcast(self, message: bytes, version: int = 0) -> None:
+        for client in list(self.clients):
+            if version and version <= client.version:
+                continue
+            if client.writer.transport.get_write_buffer_size() > MAX_BUFFERED_BYTES:
+                self.remove_client(client)
+                client.writer.close()
+                continue
+            client.writer.write(message)
+            client.version = max(client.version, version)
+
+    """
+    Serve one connection: answer the request, send the updates the client missed, then keep the connection open
+    until the client goes away.
+    Args:
+        reader (asyncio.StreamReader): The connection's reader.
+        writer (asyncio.StreamWriter): The connection's writer.
+    """
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = None
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT_SECONDS)
+            method, path, since = self.parse_request(request)
+            if method != 'GET' or path != STREAM_PATH:
+                writer.write(self.format_status(404, 'Not Found'))
+                return
+            if len(self.clients) >= self.MAX_CLIENTS:
+                writer.write(self.format_status(503, 'Service Unavailable'))
+                return
+
+            writer.write(b'HTTP/1.1 200 OK\r\n'
+                         b'Content-Type: text/event-stream\r\n'
+                         b'Cache-Control: no-cache\r\n'
+                         b'Connection: keep-alive\r\n'
+                         b'X-Accel-Buffering: no\r\n'
+                         b'Access-Control-Allow-Origin: *\r\n\r\n'
+                         + f'retry: {RETRY_MILLISECONDS}\n\n'.encode('utf-8')
+                         + self.format_snapshot())
+            version = await self.send_missed_changes(writer, since) if since is not None else self._version
+            client = StreamClient(writer, version)
+            self.clients.add(client)
+            set_stream_clients(len(self.clients))
+            while await reader.read(1024):
+                pass
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            writer.write(self.format_status(400, 'Bad Request'))
+        except OSError:
+            pass
+        finally:
+            if client is not None:
+                self.remove_client(client)
+            writer.close()
+
+    """
+    Send a new client the changes after the version it last saw, until it has caught up with the published ones, or
+    a reset event if they aren't all kept or the version is newer than any published one.
+    Args:
+        writer (asyncio.StreamWriter): The client's connection.
+        since (int): The last version the client saw.
+    Returns:
+        int: The latest version sent to the client.
+    """
+    async def send_missed_changes(self, writer: asyncio.StreamWriter, since: int) -> int:
+        loop = asyncio.get_running_loop()
+        while since != self._version:
+            result = await loop.run_in_executor(None, self.scheduler.get_changes, since, CHANGES_PAGE_SIZE)
+            if result is None:
+                break
+            changes, latest_version, reset = result
+            if reset:
+                writer.write(self.format_message('reset', {"version": latest_version}, latest_version))
+                return latest_version
+            if not changes:
+                break
+            since = changes[-1]['version']
+            writer.write(self.format_changes(changes, latest_version))
+            await writer.drain()
+        return since
+
+    """
+    Stop sending to a client.
+    Args:
+        client (StreamClient): The client.
+    """
+    def remove_client(self, client: StreamClient) -> None:
+        self.clients.discard(client)
+        set_stream_clients(len(self.clients))
+
+    """
+    Format a snapshot event for the current snapshot.
+    Returns:
+        bytes: The encoded event.
+    """
+    def format_snapshot(self) -> bytes:
+        built_at = self.scheduler.snapshot_built_at
+        return self.format_message('snapshot', {
+            "digest": self.scheduler.snapshot_payload.digest,
+            "built_at": built_at.strftime("%Y-%m-%d %H:%M:%S") if built_at is not None else None
+        })
+
+    """
+    Format a changes event for a page of changes.
+    Args:
+        changes (list[dict]): The changes, in version order.
+        latest_version (int): The latest change version.
+    Returns:
+        bytes: The encoded event.
+    """
+    def format_changes(self, changes: list[dict], latest_version: int) -> bytes:
+        version = changes[-1]['version']
+        return self.format_message('changes', {"version": version, "more": version < latest_version,
+                                               "changes": changes}, version)
+
+    """
+    Parse the request line and the headers the stream uses.
+    Args:
+        request (bytes): The request head, up to the blank line.
+    Returns:
+        tuple[str, str, int | None]: The method, the path, and the version from the Last-Event-ID header or the
+        since argument, or None if the client sent neither.
+    Raises:
+        ValueError: If the request line or the version can't be parsed.
+    """
+    @staticmethod
+    def parse_request(request: bytes) -> tuple[str, str, int | None]:
+        lines = request.decode('latin-1').split('\r\n')
+        method, target, _ = lines[0].split(' ')
+        url = urlsplit(target)
+        since = parse_qs(url.query).get('since', [None])[0]
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'last-event-id' and value.strip():
+                since = value.strip()
+        if since is not None and not (since.isascii() and since.isdigit()):
+            raise ValueError('since must be a version number')
+        return method, url.path, int(since) if since is not None else None
+
+    """
+    Format a Server-Sent Event.
+    Args:
+        event (str): The event name.
+        data (dict): The event data, sent as JSON.
+        event_id (int, optional): The event ID, which the client sends back as Last-Event-ID when it reconnects.
+    Returns:
+        bytes: The encoded event.
+    """
+    @staticmethod
+    def format_message(event: str, data: dict, event_id: int | None = None) -> bytes:
+        message = f'id: {event_id}\n' if event_id is not None else ''
+        message += f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+        return message.encode('utf-8')
+
+    """
+    Format a plain HTTP response without a body.
+    Args:
+        status (int): The status code.
+        reason (str): The reason phrase.
+    Returns:
+        bytes: The encoded response.
+    """
+    @staticmethod
+    def format_status(status: int, reason: str) -> bytes:
+        return f'HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'.encode('utf-8')
@@ -3,39 +3,61 @@ from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
-import json
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+from collections.abc import Iterator
 
-from utils.Web_Utils import get_query_selector, fetch_body
+from utils.Web_Utils import fetch_body, iter_script_json_array
+from utils.Metrics import record_parse_error
 
 
 class FinnlyConnectHandler:
+    """
+    Fetches events from a FinnlyConnect schedule page.
+    Each event's rink is its schedule item's facility name. It is always included in the event notes, and is also used
+    as the notes of the event's arena unless facility_notes is False, in which case every event shares the given arena.
+    Options:
+        open_skate_event_name (str, optional): The schedule name of open skate sessions. Defaults to "Open Skating".
+        developmental_hockey_event_name (str, optional): The schedule name of developmental hockey sessions.
+        Defaults to "Developmental Ice".
+        facility_notes (bool, optional): Whether the facility name is used as the arena's notes. Defaults to True.
+    """
 
-    def __init__(self, arena: Arena, open_skate_cost: Cost, developmental_hockey_cost: Cost,
-                 url: str, open_skate_event_name: str="Open Skating",
-                 developmental_hockey_event_name: str="Developmental Ice"):
-        self.arena = arena
-        self.open_skate_cost = open_skate_cost
-        self.developmental_hockey_cost = developmental_hockey_cost
-        self.url = url
-        self.open_skate_event_name = open_skate_event_name
-        self.developmental_hockey_event_name = developmental_hockey_event_name
+    def __init__(self, config: SourceConfig):
+        self.name = config.name
+        self.arena = config.get_arena()
+        self.facility_notes = config.get_option('facility_notes', True)
+        self.open_skate_cost = config.get_cost('open_skate')
+        self.developmental_hockey_cost = config.get_cost('stick_and_puck')
+        self.url = config.url
+        self.open_skate_event_name = config.get_option('open_skate_event_name', "Open Skating")
+        self.developmental_hockey_event_name = config.get_option('developmental_hockey_event_name', "Developmental Ice")
 
     """
     Fetches public skate and developmental hockey events from website.
+    Schedule items outside the window are skipped by comparing their ISO timestamps before anything is parsed.
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
         list[Event]: A list of Event objects representing the fetched events.
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
+        print(f'Fetching {self.name} events...')
         events = []
+        window_start = window.start.strftime("%Y-%m-%dT%H:%M:%S")
+        window_end = window.end.strftime("%Y-%m-%dT%H:%M:%S")
 
         try:
             online_schedule_json = self.get_json_objects_from_site()
 
             for online_schedule in online_schedule_json:
                 # print('Online Schedule: {}'.format(online_schedule))
+                start_time = online_schedule['EventStartTime']
+                if not window_start <= start_time <= window_end:
+                    continue
+
                 facility_name = online_schedule['FacilityName']
                 event_name = online_schedule['AccountName']
-                start_time = online_schedule['EventStartTime']
                 end_time = online_schedule['EventEndTime']
                 start_datetime_object = datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
                 end_datetime_object = datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
@@ -44,42 +66,44 @@ class FinnlyConnectHandler:
 
                 if event_name is not None and event_name != "":
                     if self.developmental_hockey_event_name in event_name.strip():
-                        arena = self.arena
-                        arena.set_notes(facility_name)
+                        arena = self.get_arena(facility_name)
                         event_notes = event_name + " - " + facility_name
                         event = self.create_event(EventType.STICK_AND_PUCK, arena, self.developmental_hockey_cost,
                                                   start_datetime_object, end_datetime_object, event_notes)
                         events.append(event)
                     elif self.open_skate_event_name in event_name.strip():
-                        arena = self.arena
-                        arena.set_notes(facility_name)
+                        arena = self.get_arena(facility_name)
                         event_notes = event_name + " - " + facility_name
                         event = self.create_event(EventType.OPEN_SKATE, arena, self.open_skate_cost,
                                                   start_datetime_object, end_datetime_object, event_notes)
                         events.append(event)
         except Exception as e:
-            print(f'Error fetching events: {e}')
+            print(f'Error fetching {self.name} events: {e}')
+            record_parse_error()
 
         return events
 
     """
-    Fetches the JSON objects containing the online schedule from the website.
+    Get the arena of an event at a facility.
+    Args:
+        facility_name (str): The facility name of the schedule item.
     Returns:
-        dict: A dictionary containing the online schedule JSON data.
+        Arena: The interned arena with the facility name as notes, or the shared arena if facility_notes is False.
     """
-    def get_json_objects_from_site(self) -> dict:
-        online_schedule_json = {}
+    def get_arena(self, facility_name: str) -> Arena:
+        if not self.facility_notes:
+            return self.arena
+        return self.arena.with_notes(facility_name)
 
+    """
+    Fetches the JSON objects containing the online schedule from the website.
+    Only the `_onlineScheduleList` array in the page's scripts is decoded, one schedule item at a time.
+    Returns:
+        Iterator[dict]: The online schedule items.
+    """
+    def get_json_objects_from_site(self) -> Iterator[dict]:
         website_body = fetch_body(self.url)
-        script_bodies = get_query_selector(website_body, 'script')
-        for script_body in script_bodies:
-            script_string = str(script_body.string)
-            if "eventTypeResourceList" in script_string:
-                for line in script_string.splitlines():
-                    if "_onlineScheduleList = " in line:
-                        online_schedule_json = self.get_online_schedule_json(line)
-
-        return online_schedule_json
+        return iter_script_json_array(website_body, '_onlineScheduleList')
 
     """
     Creates an Event object with the provided details.
@@ -104,26 +128,3 @@ class FinnlyConnectHandler:
             notes=notes
         )
         return event
-
-    """
-    Extracts the online schedule JSON from the provided string.
-    Args:
-        online_schedule_list_string (str): The string containing the online schedule list.
-    Returns:
-        dict: A dictionary containing the online schedule JSON data.
-    """
-    def get_online_schedule_json(self, online_schedule_list_string) -> dict:
-        return self.convert_string_to_json(online_schedule_list_string
-                                      .split(' = ')[1]
-                                      .rstrip(';'))
-
-    """
-    Converts a JSON string to a dictionary.
-    Args:
-        json_string (str): The JSON string to be converted.
-    Returns:
-        dict: A dictionary representation of the JSON string.
-    """
-    @staticmethod
-    def convert_string_to_json(json_string) -> dict:
-        return json.loads(json_string)
\ No newline at end of file
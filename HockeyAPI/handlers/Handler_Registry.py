@@ -0,0 +1,117 @@
+import importlib
+import json
+import os
+import threading
+from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+
+SOURCES_CONFIG_PATH = os.environ.get(
+    'SOURCES_CONFIG', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'sources.json'))
+
+# Adapter name -> (module, class). Each adapter class is created with a SourceConfig.
+# Platform adapters read any source on their platform; the site adapters still carry parsing rules for the one
+# source on their platform so far, and only take the source's URL, arenas and costs from config.
+ADAPTERS = {
+    'active_communities': ('handlers.ActiveCommunitiesHandler', 'ActiveCommunitiesHandler'),
+    'finnly_connect': ('handlers.FinnlyConnectHandler', 'FinnlyConnectHandler'),
+    'recurring_schedule': ('handlers.RecurringScheduleHandler', 'RecurringScheduleHandler'),
+    'burnsville_civicplus': ('location_handlers.Burnsville', 'Burnsville'),
+    'eagan_ical': ('location_handlers.Eagan', 'Eagan'),
+    'lakeville_finnly_connect': ('location_handlers.Lakeville', 'Lakeville'),
+    'rosemount_pdf': ('location_handlers.Rosemount', 'Rosemount'),
+    'south_st_paul_civicplus': ('location_handlers.SouthStPaul', 'SouthStPaul'),
+}
+
+"""
+A registry of the location sources.
+Sources are declared as data in config/sources.json: the adapter that reads them, their URL, arenas, costs and
+refresh interval, so adding a rink on a supported platform is a config change only. Each adapter is only imported the
+first time one of its sources is fetched, which keeps pdfplumber, BeautifulSoup, requests and the other parser
+dependencies out of a worker until a source that needs them is refreshed.
+"""
+
+
+class LazyLocationHandler:
+    """
+    Stands in for a source's adapter until the source's events are first fetched, then imports and creates it.
+    The name and refresh interval come from the source config, so scheduling a source never imports its adapter.
+    Attributes:
+        NAME (str): The source name.
+        REFRESH_INTERVAL (timedelta): How long the source's events stay fresh.
+        config (SourceConfig): The source config.
+    """
+    def __init__(self, config: SourceConfig):
+        self.NAME = config.name
+        self.REFRESH_INTERVAL = config.refresh_interval
+        self.config = config
+        self._handler = None
+        self._lock = threading.Lock()
+
+    """
+    Fetch the source's events, importing and creating its adapter first if needed.
+    Args:
+        window (TimeWindow): The window to fetch events for.
+    Returns:
+        list[Event]: The source's events.
+    """
+    def get_events(self, window: TimeWindow) -> list[Event]:
+        return self.get_handler().get_events(window)
+
+    """
+    Get the source's adapter, importing its module and creating it on first use.
+    Returns:
+        The adapter instance.
+    """
+    def get_handler(self):
+        if self._handler is None:
+            with self._lock:
+                if self._handler is None:
+                    module_name, class_name = ADAPTERS[self.config.adapter]
+                    adapter = getattr(importlib.import_module(module_name), class_name)
+                    self._handler = adapter(self.config)
+        return self._handler
+
+    """
+    Check whether the source's adapter was imported and created yet.
+    Returns:
+        bool: True once the adapter exists.
+    """
+    def is_loaded(self) -> bool:
+        return self._handler is not None
+
+
+"""
+Load the source configs declared in a JSON file.
+Args:
+    path (str, optional): The config file. Defaults to SOURCES_CONFIG_PATH.
+Returns:
+    list[SourceConfig]: The sources, in the order they are declared.
+Raises:
+    ValueError: If a source is malformed, uses an unknown adapter or reuses another source's name.
+"""
+def load_source_configs(path: str = SOURCES_CONFIG_PATH) -> list[SourceConfig]:
+    with open(path, 'r', encoding='utf-8') as config_file:
+        configs = [SourceConfig.from_dict(data) for data in json.load(config_file)]
+
+    names = set()
+    for config in configs:
+        if config.adapter not in ADAPTERS:
+            raise ValueError(f'Source {config.name} uses unknown adapter {config.adapter!r}')
+        if config.name in names:
+            raise ValueError(f'Source {config.name} is declared more than once')
+        names.add(config.name)
+    return configs
+
+
+"""
+Create a lazy stand-in for every declared source.
+Args:
+    configs (list[SourceConfig], optional): The sources. Defaults to the ones in SOURCES_CONFIG_PATH.
+Returns:
+    list[LazyLocationHandler]: The location handlers, in declaration order.
+"""
+def create_location_handlers(configs: list[SourceConfig] | None = None) -> list[LazyLocationHandler]:
+    if configs is None:
+        configs = load_source_configs()
+    return [LazyLocationHandler(config) for config in configs]
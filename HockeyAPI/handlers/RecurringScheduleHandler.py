@@ -0,0 +1,106 @@
+from datetime import datetime
+from enums.Event_Type import EventType
+from enums.Week_Day import WeekDay
+from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+import utils.Holidays
+from utils.Metrics import record_parse_error
+
+
+class RecurringScheduleHandler:
+    """
+    Creates events from a fixed weekly schedule, for arenas that publish their sessions as a recurring rule instead
+    of a calendar.
+    Options:
+        sessions (list[dict]): The weekly sessions, each with a weekday, a start and end "%H:%M" time and an optional
+        event_type name. Event types default to OPEN_SKATE, and each session's cost is the source cost keyed by the
+        lower-case event type name, e.g. "open_skate".
+        season (dict, optional): The first and last "%m-%d" day of the season, which may wrap into the next year.
+        Sessions run all year without one.
+        skip_holidays (bool, optional): Whether to skip sessions on holidays. Defaults to False.
+        notes (str, optional): The notes of every event.
+    """
+    TIME_FORMAT = "%H:%M"
+    SEASON_DAY_FORMAT = "%m-%d"
+
+    def __init__(self, config: SourceConfig):
+        self.name = config.name
+        self.arena = config.get_arena()
+        self.notes = config.get_option('notes', "")
+        self.skip_holidays = config.get_option('skip_holidays', False)
+        self.season = self.parse_season(config.get_option('season'))
+        self.sessions = []
+        for session in config.get_option('sessions', []):
+            event_type = EventType[session.get('event_type', EventType.OPEN_SKATE.name)]
+            self.sessions.append((
+                WeekDay.get_weekday(session['weekday']).value,
+                datetime.strptime(session['start'], self.TIME_FORMAT).time(),
+                datetime.strptime(session['end'], self.TIME_FORMAT).time(),
+                event_type,
+                config.get_cost(event_type.name.lower())
+            ))
+
+    """
+    Creates the scheduled sessions on every day in the window.
+    Args:
+        window (TimeWindow): The window to create events for.
+    Returns:
+        list[Event]: A list of Event objects representing the scheduled sessions.
+    """
+    def get_events(self, window: TimeWindow) -> list[Event]:
+        print(f'Fetching {self.name} events...')
+        events = []
+
+        try:
+            for day in window.get_days():
+                if not self.is_in_season(day) or (self.skip_holidays and utils.Holidays.is_holiday(day)):
+                    continue
+                for weekday, start, end, event_type, cost in self.sessions:
+                    if day.weekday() != weekday:
+                        continue
+                    event = Event(
+                        event_type=event_type,
+                        arena=self.arena,
+                        start_time=datetime.combine(day.date(), start),
+                        end_time=datetime.combine(day.date(), end),
+                        cost=cost,
+                        notes=self.notes
+                    )
+                    events.append(event)
+        except Exception as e:
+            print(f'Error creating {self.name} events: {e}')
+            record_parse_error()
+
+        return events
+
+    """
+    Check whether a day falls in the season.
+    Args:
+        day (datetime): The day to check.
+    Returns:
+        bool: True if the day is in the season, or if there is no season.
+    """
+    def is_in_season(self, day: datetime) -> bool:
+        if self.season is None:
+            return True
+        first_day, last_day = self.season
+        month_day = (day.month, day.day)
+        if first_day <= last_day:
+            return first_day <= month_day <= last_day
+        return month_day >= first_day or month_day <= last_day
+
+    """
+    Parse the season option.
+    Args:
+        season (dict | None): The season's start and end "%m-%d" days.
+    Returns:
+        tuple[tuple[int, int], tuple[int, int]] | None: The (month, day) of the first and last day, or None.
+    """
+    @staticmethod
+    def parse_season(season: dict | None) -> tuple[tuple[int, int], tuple[int, int]] | None:
+        if not season:
+            return None
+        first_day = datetime.strptime(season['start'], RecurringScheduleHandler.SEASON_DAY_FORMAT)
+        last_day = datetime.strptime(season['end'], RecurringScheduleHandler.SEASON_DAY_FORMAT)
+        return (first_day.month, first_day.day), (last_day.month, last_day.day)
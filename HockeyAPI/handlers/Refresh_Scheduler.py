@@ -0,0 +1,406 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from handlers.Change_Feed import ChangeFeed, diff_source_events
+from handlers.Event_Handler import EventHandler
+from handlers.Event_Store import EventStore
+from models.EncodedPayload import EncodedPayload
+from models.EventQuery import EventQuery
+from handlers.Snapshot_Store import SnapshotStore
+from handlers.Source_Cache import SourceCache
+
+
+class RefreshScheduler:
+    """
+    Keeps the aggregated event list warm by refreshing the location handlers in a background thread.
+    Each handler is refreshed into the SourceCache on its own REFRESH_INTERVAL and its cached result is merged
+    into the EventStore. The JSON-ready snapshot served by the API is rebuilt from an EventStore query every
+    REBUILD_INTERVAL, encoded once into an EncodedPayload and swapped in as a whole.
+    The previous snapshot, however stale, is served while a refresh runs.
+    With a SnapshotStore, the last saved snapshot is served as soon as the scheduler starts, and source results are
+    saved after every refresh and loaded from the store every SYNC_INTERVAL, so workers pick up each other's results
+    instead of scraping every site again after a restart. A worker only refreshes the due handlers whose refresh lease
+    it takes in the store, so each site is scraped by one worker at a time however many workers there are.
+    Every refresh diffs the handler's events against its previous ones, and the changes are saved to the store with
+    the handler's result, or kept in a ChangeFeed without a store. Listeners are called on the refresh thread after
+    every rebuild of the snapshot, such as the EventStream that pushes updates to clients.
+    """
+
+    def __init__(self, event_handler: EventHandler | None = None,
+                 rebuild_interval: timedelta = timedelta(minutes=5),
+                 default_refresh_interval: timedelta = timedelta(hours=12),
+                 snapshot_store: SnapshotStore | None = None,
+                 sync_interval: timedelta = timedelta(seconds=15)):
+        self.event_handler = event_handler if event_handler is not None else EventHandler()
+        self.REBUILD_INTERVAL = rebuild_interval
+        self.SYNC_INTERVAL = sync_interval
+        # A lease outlives the longest refresh, so it only expires early if its worker died mid-refresh
+        self.LEASE_SECONDS = self.event_handler.REQUEST_DEADLINE_SECONDS + 60
+        self.snapshot_store = snapshot_store
+        self.change_feed = ChangeFeed() if snapshot_store is None else None
+        self.worker_id = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._sources_loaded_revision = 0
+        self._lease_retry_at: dict[str, datetime] = {}
+
+        self.source_cache = SourceCache(self.event_handler, retry_interval=rebuild_interval,
+                                        default_refresh_interval=default_refresh_interval)
+        self.event_store = EventStore()
+        self.data_version = self.source_cache.get_version()
+        self._refresh_all = False
+        self.snapshot: list[dict] = []
+        self.snapshot_payload = EncodedPayload.from_json(self.snapshot)
+        self.snapshot_built_at: datetime | None = None
+
+        self._snapshot_ready = threading.Event()
+        self._listeners: list[Callable[[], None]] = []
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    """
+    Start the background refresh thread, serving the last saved snapshot until it builds one. Calling it again is a
+    no-op.
+    """
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self.load_saved_snapshot()
+                self._thread = threading.Thread(target=self.run, name='refresh-scheduler', daemon=True)
+                self._thread.start()
+
+    """
+    Get the latest snapshot of the aggregated events.
+    Args:
+        timeout (float, optional): Seconds to wait for the first snapshot to be built. Defaults to not waiting.
+    Returns:
+        list[dict]: The JSON-ready events of the latest snapshot, or an empty list if none is built yet.
+    """
+    def get_snapshot(self, timeout: float | None = 0) -> list[dict]:
+        self._snapshot_ready.wait(timeout)
+        return self.snapshot
+
+    """
+    Get the latest snapshot of the aggregated events, already serialized and compressed.
+    Args:
+        timeout (float, optional): Seconds to wait for the first snapshot to be built. Defaults to not waiting.
+    Returns:
+        EncodedPayload: The encoded events of the latest snapshot, or of an empty list if none is built yet.
+    """
+    def get_snapshot_payload(self, timeout: float | None = 0) -> EncodedPayload:
+        self._snapshot_ready.wait(timeout)
+        return self.snapshot_payload
+
+    """
+    Query the stored events with the filters of an API request.
+    Args:
+        query (EventQuery): The filters.
+        timeout (float, optional): Seconds to wait for the first snapshot to be built. Defaults to not waiting.
+    Returns:
+        list[dict]: The JSON-ready matching events, ordered by start time.
+    """
+    def query_events(self, query: EventQuery, timeout: float | None = 0) -> list[dict]:
+        self._snapshot_ready.wait(timeout)
+        events = self.event_store.query(window=query.window, city=query.city, arena=query.arena,
+                                        event_type=query.event_type, limit=query.limit)
+        return self.event_handler.serialize_events(events)
+
+    """
+    Check whether a snapshot has been built yet.
+    Returns:
+        bool: True once the first snapshot has been swapped in.
+    """
+    def has_snapshot(self) -> bool:
+        return self._snapshot_ready.is_set()
+
+    """
+    Register a function to call after every rebuild of the snapshot.
+    Args:
+        listener (Callable[[], None]): The function, called on the refresh thread, which it must not block for long.
+    """
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    """
+    Call every listener, logging the ones that fail.
+    """
+    def notify_listeners(self) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f'Error notifying a refresh listener: {e}')
+
+    """
+    Mark every handler as due and wake the refresh thread.
+    The current snapshot keeps being served until the refreshed one replaces it.
+    """
+    def refresh_now(self) -> None:
+        self._refresh_all = True
+        self._wake.set()
+
+    """
+    Background loop that refreshes due handlers and rebuilds the snapshot until the process exits.
+    The snapshot is rebuilt whenever the stored events change, and at least every REBUILD_INTERVAL.
+    """
+    def run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                changed = self.load_saved_sources()
+                changed = self.refresh_due_sources() or changed
+                if changed or self.is_rebuild_due():
+                    self.rebuild_snapshot()
+                    self.notify_listeners()
+            except Exception as e:
+                print(f'Error refreshing events: {e}')
+            self._wake.wait(self.get_seconds_until_next_run())
+
+    """
+    Refresh every handler that is due, or every handler after refresh_now, skipping the ones another worker holds
+    the refresh lease of.
+    Returns:
+        bool: True if any handler's cached result changed.
+    """
+    def refresh_due_sources(self) -> bool:
+        now = datetime.now()
+        refresh_all, self._refresh_all = self._refresh_all, False
+        self._lease_retry_at = {name: retry_at for name, retry_at in self._lease_retry_at.items() if retry_at > now}
+        due_handlers = [handler for handler in self.event_handler.get_location_handlers()
+                        if refresh_all or self.is_due(handler, now)]
+        leased_handlers = self.acquire_leases(due_handlers, now)
+        changed = False
+        try:
+            # Another worker may have saved some of them between the last load and taking their leases, and their
+            # changes must be diffed against its results
+            due_handlers = leased_handlers
+            if leased_handlers and self.load_saved_sources():
+                changed = True
+                if not refresh_all:
+                    due_handlers = [handler for handler in leased_handlers if self.source_cache.is_due(handler, now)]
+            if not due_handlers:
+                return changed
+
+            print(f'Refreshing {len(due_handlers)} location handlers...')
+            names = [self.event_handler.get_handler_name(handler) for handler in due_handlers]
+            previous_entries = {name: self.source_cache.entries.get(name) for name in names}
+            previous_events = {name: self.source_cache.get_events(name) for name in names}
+            window = self.event_handler.get_fetch_window()
+            self.source_cache.refresh(due_handlers)
+            for name in names:
+                events = self.source_cache.get_events(name)
+                self.event_store.replace_source(name, events)
+                # Only the days both fetch windows cover can tell a schedule change from the window moving on
+                previous_entry = previous_entries[name]
+                diff_window = window
+                if previous_entry is not None and previous_entry.events:
+                    diff_window = window.get_overlap(self.event_handler.get_fetch_window_at(previous_entry.fetched_at))
+                self.save_source(name, diff_source_events(name, previous_events[name], events, diff_window))
+            self.data_version = self.source_cache.get_version()
+            return True
+        finally:
+            self.release_leases(leased_handlers)
+
+    """
+    Check whether a handler is due and not waiting for another worker to release its lease.
+    Args:
+        handler: The location handler.
+        now (datetime): The current time.
+    Returns:
+        bool: True if the handler should be refreshed.
+    """
+    def is_due(self, handler, now: datetime) -> bool:
+        retry_at = self._lease_retry_at.get(self.event_handler.get_handler_name(handler))
+        return (retry_at is None or retry_at <= now) and self.source_cache.is_due(handler, now)
+
+    """
+    Check whether the snapshot should be rebuilt even though the stored events didn't change.
+    Before the first snapshot, it waits for the results of handlers another worker is refreshing rather than
+    serving an empty one.
+    Returns:
+        bool: True if no snapshot was built yet or the current one is older than REBUILD_INTERVAL.
+    """
+    def is_rebuild_due(self) -> bool:
+        if self.snapshot_built_at is None:
+            return not self._lease_retry_at
+        return datetime.now() - self.snapshot_built_at >= self.REBUILD_INTERVAL
+
+    """
+    Take the refresh leases of handlers, so no other worker refreshes them at the same time.
+    Handlers leased by another worker are retried after SYNC_INTERVAL, by which time their results are usually saved.
+    Args:
+        handlers (list): The location handlers to refresh.
+        now (datetime): The current time.
+    Returns:
+        list: The handlers whose lease was taken, or every handler without a snapshot store.
+    """
+    def acquire_leases(self, handlers: list, now: datetime) -> list:
+        if self.snapshot_store is None:
+            return handlers
+
+        leased_handlers = []
+        for handler in handlers:
+            name = self.event_handler.get_handler_name(handler)
+            try:
+                acquired = self.snapshot_store.acquire_lease(name, self.worker_id, self.LEASE_SECONDS)
+            except (sqlite3.Error, OSError) as e:
+                # Scraping a site twice is better than never refreshing it
+                print(f'Error taking the {name} refresh lease: {e}')
+                acquired = True
+            if acquired:
+                self._lease_retry_at.pop(name, None)
+                leased_handlers.append(handler)
+            else:
+                self._lease_retry_at[name] = now + self.SYNC_INTERVAL
+
+        skipped = len(handlers) - len(leased_handlers)
+        if skipped:
+            print(f'Skipping {skipped} location handlers another worker is refreshing')
+        return leased_handlers
+
+    """
+    Release the refresh leases taken by acquire_leases.
+    Args:
+        handlers (list): The leased location handlers.
+    """
+    def release_leases(self, handlers: list) -> None:
+        if self.snapshot_store is None:
+            return
+        for handler in handlers:
+            name = self.event_handler.get_handler_name(handler)
+            try:
+                self.snapshot_store.release_lease(name, self.worker_id)
+            except (sqlite3.Error, OSError) as e:
+                print(f'Error releasing the {name} refresh lease: {e}')
+
+    """
+    Rebuild the snapshot from the events in the display window and swap it in.
+    """
+    def rebuild_snapshot(self) -> None:
+        events = self.event_store.query(window=self.event_handler.get_display_window())
+        print(f'Total events stored: {len(self.event_store)}, in the display window: {len(events)}')
+        snapshot = self.event_handler.serialize_events(events)
+        previous_payload = self.snapshot_payload
+        self.snapshot_payload = EncodedPayload.from_json(snapshot, previous=previous_payload)
+        self.snapshot = snapshot
+        self.snapshot_built_at = datetime.now()
+        self._snapshot_ready.set()
+        if self.snapshot_payload is not previous_payload:
+            self.save_snapshot()
+
+    """
+    Serve the snapshot saved in the snapshot store, if there is one, until a new one is built.
+    """
+    def load_saved_snapshot(self) -> None:
+        if self.snapshot_store is None:
+            return
+        try:
+            saved = self.snapshot_store.load_snapshot()
+        except (sqlite3.Error, OSError) as e:
+            print(f'Error loading the saved snapshot: {e}')
+            return
+        if saved is None:
+            return
+
+        payload, built_at = saved
+        self.snapshot = json.loads(payload.bodies['identity'])
+        self.snapshot_payload = payload
+        self.snapshot_built_at = built_at
+        self._snapshot_ready.set()
+        print(f'Serving the snapshot saved at {built_at} with {len(self.snapshot)} events')
+
+    """
+    Load the source results saved to the snapshot store since the last load, by this worker or any other, and merge
+    the ones newer than the cached results into the EventStore.
+    Returns:
+        bool: True if any source was updated.
+    """
+    def load_saved_sources(self) -> bool:
+        if self.snapshot_store is None:
+            return False
+        try:
+            entries, self._sources_loaded_revision = self.snapshot_store.load_sources(
+                self._sources_loaded_revision)
+        except (sqlite3.Error, OSError) as e:
+            print(f'Error loading saved sources: {e}')
+            return False
+
+        restored = self.source_cache.restore(entries)
+        for name in restored:
+            self.event_store.replace_source(name, self.source_cache.get_events(name))
+        if restored:
+            self.data_version = self.source_cache.get_version()
+            print(f'Loaded saved events of {len(restored)} location handlers')
+        return bool(restored)
+
+    """
+    Save a handler's cached result and the changes to its events to the snapshot store, or record the changes in
+    the change feed without a store.
+    Args:
+        name (str): The handler name.
+        changes (list[dict], optional): The changes, from diff_source_events.
+    """
+    def save_source(self, name: str, changes: list[dict] = ()) -> None:
+        if self.snapshot_store is None:
+            self.change_feed.record(changes)
+            return
+        entry = self.source_cache.entries.get(name)
+        if entry is None:
+            return
+        try:
+            self.snapshot_store.save_source(name, entry, changes)
+        except (sqlite3.Error, OSError) as e:
+            print(f'Error saving the {name} events: {e}')
+
+    """
+    Get the changes to the handlers' events after a version, from the snapshot store if there is one so every
+    worker answers with the same versions.
+    Args:
+        since (int): The last version the client has seen.
+        limit (int): The maximum number of changes to return.
+    Returns:
+        tuple[list[dict], int, bool] | None: The changes in version order, the latest version, and True if the client
+        must reset because the changes since its version are not all available; or None if the store can't be read.
+    """
+    def get_changes(self, since: int, limit: int) -> tuple[list[dict], int, bool] | None:
+        if self.snapshot_store is None:
+            return self.change_feed.get_changes(since, limit)
+        try:
+            return self.snapshot_store.load_changes(since, limit)
+        except (sqlite3.Error, OSError) as e:
+            print(f'Error loading changes: {e}')
+            return None
+
+    """
+    Save the current snapshot to the snapshot store.
+    """
+    def save_snapshot(self) -> None:
+        if self.snapshot_store is None:
+            return
+        try:
+            self.snapshot_store.save_snapshot(self.snapshot_payload, self.snapshot_built_at)
+        except (sqlite3.Error, OSError) as e:
+            print(f'Error saving the snapshot: {e}')
+
+    """
+    Get how long the refresh thread can sleep before a handler is due, the snapshot needs rebuilding or the snapshot
+    store should be checked for other workers' results.
+    Returns:
+        float: The number of seconds to sleep.
+    """
+    def get_seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        next_run_at = now + self.REBUILD_INTERVAL
+        if self.snapshot_built_at is not None:
+            next_run_at = min(next_run_at, self.snapshot_built_at + self.REBUILD_INTERVAL)
+        if self.snapshot_store is not None:
+            next_run_at = min(next_run_at, now + self.SYNC_INTERVAL)
+        for handler in self.event_handler.get_location_handlers():
+            next_due_at = self.source_cache.get_next_due_at(handler)
+            retry_at = self._lease_retry_at.get(self.event_handler.get_handler_name(handler))
+            next_run_at = min(next_run_at, max(next_due_at, retry_at) if retry_at is not None else next_due_at)
+        return max((next_run_at - datetime.now()).total_seconds(), 0)
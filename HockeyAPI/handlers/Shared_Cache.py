@@ -0,0 +1,208 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from flask_caching.backends.base import BaseCache
+
+SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', '/tmp/hockey-api/cache.sqlite3')
+BUSY_TIMEOUT_SECONDS = 30
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS response_cache ("
+    " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS response_cache_expires_at ON response_cache (expires_at)",
+    "CREATE INDEX IF NOT EXISTS response_cache_created_at ON response_cache (created_at)",
+)
+
+
+class SharedCache(BaseCache):
+    """
+    A Flask-Caching backend stored in a SQLite file, so every gunicorn worker of the container reads and writes
+    the same entries, and clearing the cache from one worker clears it for all of them. It needs no outside service:
+    the file lives on the /tmp tmpfs by default and is opened in WAL mode, so readers never block a writer.
+    Values are pickled. An expires_at of 0 never expires; expired entries are removed on the next write, and the
+    oldest entries are dropped once there are more than threshold of them.
+    Configured with CACHE_TYPE 'handlers.Shared_Cache.SharedCache', CACHE_SHARED_PATH and CACHE_THRESHOLD.
+    """
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, default_timeout: int = 300, threshold: int = 500):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.threshold = threshold
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    """
+    Create the backend from the Flask-Caching config.
+    Args:
+        app (Flask): The app.
+        config (dict): The cache config.
+        args (list): Positional arguments for the backend.
+        kwargs (dict): Keyword arguments for the backend.
+    Returns:
+        SharedCache: The backend.
+    """
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(dict(path=config.get('CACHE_SHARED_PATH', SHARED_CACHE_PATH),
+                           threshold=config.get('CACHE_THRESHOLD', 500)))
+        return cls(*args, **kwargs)
+
+    """
+    Get a cached value.
+    Args:
+        key (str): The cache key.
+    Returns:
+        The value, or None if it is missing, expired or can't be read.
+    """
+    def get(self, key: str):
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (key, time.time())).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            print(f'Could not read the cached {key}: {e}')
+            return None
+
+    """
+    Cache a value, replacing any value cached under the key.
+    Args:
+        key (str): The cache key.
+        value: The value, which must be picklable.
+        timeout (int, optional): Seconds until the value expires, 0 for never. Defaults to the default timeout.
+    Returns:
+        bool: True once the value is stored.
+    """
+    def set(self, key: str, value, timeout: int | None = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, data, self._get_expires_at(timeout, now), now))
+            self._prune(connection, now)
+        return True
+
+    """
+    Cache a value only if the key has no live value yet.
+    Args:
+        key (str): The cache key.
+        value: The value, which must be picklable.
+        timeout (int, optional): Seconds until the value expires, 0 for never. Defaults to the default timeout.
+    Returns:
+        bool: True if the value was stored.
+    """
+    def add(self, key: str, value, timeout: int | None = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO response_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at,"
+                " created_at = excluded.created_at"
+                " WHERE response_cache.expires_at != 0 AND response_cache.expires_at <= ?",
+                (key, data, self._get_expires_at(timeout, now), now, now))
+            return cursor.rowcount > 0
+
+    """
+    Remove a cached value.
+    Args:
+        key (str): The cache key.
+    Returns:
+        bool: True if a value was removed.
+    """
+    def delete(self, key: str) -> bool:
+        with self._transaction() as connection:
+            return connection.execute("DELETE FROM response_cache WHERE key = ?", (key,)).rowcount > 0
+
+    """
+    Check whether a key has a live value.
+    Args:
+        key (str): The cache key.
+    Returns:
+        bool: True if the key is cached and not expired.
+    """
+    def has(self, key: str) -> bool:
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM response_cache WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (key, time.time())).fetchone()
+        return row is not None
+
+    """
+    Remove every cached value, for every worker.
+    Returns:
+        bool: True once the cache is empty.
+    """
+    def clear(self) -> bool:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM response_cache")
+        return True
+
+    """
+    Internal method to get when a value cached now expires
+    Args:
+        timeout (int | None): The requested timeout.
+        now (float): The current Unix time.
+    Returns:
+        float: The Unix time it expires at, or 0 if it never does.
+    """
+    def _get_expires_at(self, timeout: int | None, now: float) -> float:
+        timeout = self._normalize_timeout(timeout)
+        return now + timeout if timeout > 0 else 0
+
+    """
+    Internal method to remove the expired values, and the oldest ones past the threshold
+    Args:
+        connection (sqlite3.Connection): A connection in a write transaction.
+        now (float): The current Unix time.
+    """
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM response_cache WHERE expires_at != 0 AND expires_at <= ?", (now,))
+        count = connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+        if count > self.threshold:
+            connection.execute(
+                "DELETE FROM response_cache WHERE key IN"
+                " (SELECT key FROM response_cache ORDER BY created_at LIMIT ?)", (count - self.threshold,))
+
+    """
+    Internal method to run statements in a transaction on a new connection, which is closed afterwards
+    Returns:
+        Iterator[sqlite3.Connection]: The connection, committed when the block ends without an error.
+    """
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    """
+    Internal method to open a connection, creating the file and its schema on first use
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    with connection:
+                        for statement in SCHEMA:
+                            connection.execute(statement)
+                    self._schema_ready = True
+        return connection
@@ -0,0 +1,234 @@
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from handlers.Source_Cache import SourceCacheEntry
+from models.EncodedPayload import EncodedPayload
+
+SNAPSHOT_DB_PATH = os.environ.get('SNAPSHOT_DB_PATH', '/tmp/hockey-api/snapshots.sqlite3')
+SCHEMA_VERSION = 2
+BUSY_TIMEOUT_SECONDS = 30
+MAX_CHANGES = 10000
+# The current Unix time, read by SQLite once the writer holds the lock
+SQL_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+# Tables whose rows are discarded when the file was written with another SCHEMA_VERSION
+DATA_TABLES = ('source_snapshots', 'aggregate_snapshot', 'event_changes')
+# The next source revision, read once the writer holds the lock, so revisions strictly increase in commit order
+SQL_NEXT_REVISION = "(SELECT COALESCE(MAX(revision), 0) + 1 FROM source_snapshots)"
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS source_snapshots ("
+    " name TEXT PRIMARY KEY, fetched_at REAL NOT NULL, checked_at REAL NOT NULL, last_error TEXT,"
+    " events BLOB NOT NULL, revision INTEGER NOT NULL)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS source_snapshots_revision ON source_snapshots (revision)",
+    "CREATE TABLE IF NOT EXISTS aggregate_snapshot ("
+    " id INTEGER PRIMARY KEY CHECK (id = 1), built_at REAL NOT NULL, digest TEXT NOT NULL, body BLOB NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS event_changes ("
+    " version INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, change TEXT NOT NULL, body TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS refresh_leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)",
+)
+
+
+class SnapshotStore:
+    """
+    Persists the per-source event snapshots and the aggregated API snapshot in a SQLite file, so a restarted or
+    newly forked worker starts from the last snapshots instead of scraping every site again.
+    The file lives on the /tmp tmpfs by default and is shared by every worker of the container. It is opened in WAL
+    mode, so readers never block the worker that is writing. Source events are stored pickled and zlib-compressed;
+    a file written with another SCHEMA_VERSION is emptied instead of being read. Every save gives the source a new
+    revision, so a worker loads exactly the sources saved since the last revision it read.
+    It also holds the refresh leases that let only one worker at a time scrape a given source, and the latest
+    MAX_CHANGES changes to the sources' events, whose versions are shared by every worker.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_DB_PATH):
+        self.path = path
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    """
+    Save the cached result of a source, and the changes it made to the source's events in the same transaction.
+    Args:
+        name (str): The source name.
+        entry (SourceCacheEntry): The source's cache entry.
+        changes (list[dict], optional): The changes, from diff_source_events.
+    """
+    def save_source(self, name: str, entry: SourceCacheEntry, changes: list[dict] = ()) -> None:
+        events = zlib.compress(pickle.dumps(entry.events, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO source_snapshots (name, fetched_at, checked_at, last_error, events, revision)"
+                f" VALUES (?, ?, ?, ?, ?, {SQL_NEXT_REVISION})",
+                (name, entry.fetched_at.timestamp(), entry.checked_at.timestamp(), entry.last_error, events))
+            if changes:
+                connection.executemany(
+                    "INSERT INTO event_changes (source, change, body) VALUES (?, ?, ?)",
+                    [(change['source'], change['change'], json.dumps(change)) for change in changes])
+                connection.execute(
+                    "DELETE FROM event_changes WHERE version <= (SELECT MAX(version) FROM event_changes) - ?",
+                    (MAX_CHANGES,))
+
+    """
+    Load the saved results of every source that was saved after a revision.
+    Args:
+        after_revision (int, optional): Only load sources saved with a later revision. Defaults to all of them.
+    Returns:
+        tuple[dict[str, SourceCacheEntry], int]: The cache entries keyed by source name, and the latest revision
+        seen, to pass as after_revision next time.
+    """
+    def load_sources(self, after_revision: int = 0) -> tuple[dict[str, SourceCacheEntry], int]:
+        entries = {}
+        latest_revision = after_revision
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT name, fetched_at, checked_at, last_error, events, revision FROM source_snapshots"
+                " WHERE revision > ?", (after_revision,)).fetchall()
+
+        for name, fetched_at, checked_at, last_error, events, revision in rows:
+            latest_revision = max(latest_revision, revision)
+            try:
+                entry = SourceCacheEntry(pickle.loads(zlib.decompress(events)), datetime.fromtimestamp(fetched_at))
+            except Exception as e:
+                print(f'Could not load the {name} snapshot: {e}')
+                continue
+            entry.checked_at = datetime.fromtimestamp(checked_at)
+            entry.last_error = last_error
+            entries[name] = entry
+        return entries, latest_revision
+
+    """
+    Load the changes saved after a version.
+    Args:
+        since (int): The last version the client has seen.
+        limit (int): The maximum number of changes to return.
+    Returns:
+        tuple[list[dict], int, bool]: The changes in version order, the latest version, and True if the client must
+        reset because the changes since its version are not all kept anymore.
+    """
+    def load_changes(self, since: int, limit: int) -> tuple[list[dict], int, bool]:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT seq FROM sqlite_sequence WHERE name = 'event_changes'").fetchone()
+            latest_version = row[0] if row is not None else 0
+            oldest_version = connection.execute("SELECT MIN(version) FROM event_changes").fetchone()[0]
+            if oldest_version is None:
+                oldest_version = latest_version + 1
+            if since > latest_version or since < oldest_version - 1:
+                return [], latest_version, True
+            rows = connection.execute(
+                "SELECT version, body FROM event_changes WHERE version > ? ORDER BY version LIMIT ?",
+                (since, limit)).fetchall()
+        return [dict(json.loads(body), version=version) for version, body in rows], latest_version, False
+
+    """
+    Save the aggregated API snapshot.
+    Args:
+        payload (EncodedPayload): The encoded snapshot.
+        built_at (datetime): When the snapshot was built.
+    """
+    def save_snapshot(self, payload: EncodedPayload, built_at: datetime) -> None:
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO aggregate_snapshot (id, built_at, digest, body) VALUES (1, ?, ?, ?)",
+                (built_at.timestamp(), payload.digest, payload.bodies['identity']))
+
+    """
+    Load the aggregated API snapshot.
+    Returns:
+        tuple[EncodedPayload, datetime] | None: The encoded snapshot and when it was built, or None if none was saved.
+    """
+    def load_snapshot(self) -> tuple[EncodedPayload, datetime] | None:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT built_at, digest, body FROM aggregate_snapshot WHERE id = 1").fetchone()
+        if row is None:
+            return None
+        built_at, digest, body = row
+        return EncodedPayload(bytes(body), digest), datetime.fromtimestamp(built_at)
+
+    """
+    Take the refresh lease of a source, so other workers skip it until it is released or expires.
+    Taking a lease the owner already holds extends it.
+    Args:
+        name (str): The source name.
+        owner (str): An ID unique to the worker taking the lease.
+        seconds (float): How long the lease lasts if it isn't released.
+    Returns:
+        bool: True if the lease was taken, False if another worker holds it.
+    """
+    def acquire_lease(self, name: str, owner: str, seconds: float) -> bool:
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f"INSERT INTO refresh_leases (name, owner, expires_at) VALUES (?, ?, {SQL_NOW} + ?)"
+                " ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+                f" WHERE refresh_leases.owner = excluded.owner OR refresh_leases.expires_at <= {SQL_NOW}",
+                (name, owner, seconds))
+            return cursor.rowcount > 0
+
+    """
+    Release the refresh lease of a source, if the owner still holds it.
+    Args:
+        name (str): The source name.
+        owner (str): The ID the lease was taken with.
+    """
+    def release_lease(self, name: str, owner: str) -> None:
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM refresh_leases WHERE name = ? AND owner = ?", (name, owner))
+
+    """
+    Internal method to run statements in a transaction on a new connection, which is closed afterwards
+    Connections are not shared between threads; SQLite serializes writers across threads and processes.
+    Returns:
+        Iterator[sqlite3.Connection]: The connection, committed when the block ends without an error.
+    """
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    """
+    Internal method to open a connection, creating the file and its schema on first use
+    Returns:
+        sqlite3.Connection: The connection.
+    """
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    self._create_schema(connection)
+                    self._schema_ready = True
+        return connection
+
+    """
+    Internal method to create the schema, or discard the data of a file written with another schema version
+    Args:
+        connection (sqlite3.Connection): An open connection.
+    """
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(SCHEMA[0])
+            row = connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is not None and row[0] != str(SCHEMA_VERSION):
+                print(f'Discarding snapshots written with schema version {row[0]}')
+                for table in DATA_TABLES:
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                               (str(SCHEMA_VERSION),))
@@ -0,0 +1,193 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from handlers.Event_Handler import EventHandler
+from models.Event import Event
+
+
+class SourceCacheEntry:
+    """
+    The last good result of a single location handler.
+    Attributes:
+        events (list[Event]): The last non-empty list of events the handler returned.
+        fetched_at (datetime): When the events were fetched.
+        checked_at (datetime): When the handler was last run, successful or not.
+        last_error (str | None): Why the last run was rejected, or None if it was kept.
+    """
+    def __init__(self, events: list[Event], fetched_at: datetime):
+        self.events = events
+        self.fetched_at = fetched_at
+        self.checked_at = fetched_at
+        self.last_error: str | None = None
+
+    """
+    Get how old the cached events are.
+    Args:
+        now (datetime): The current time.
+    Returns:
+        timedelta: The time since the events were fetched.
+    """
+    def get_age(self, now: datetime) -> timedelta:
+        return now - self.fetched_at
+
+
+class SourceCache:
+    """
+    Caches the last good events of each location handler, keyed by handler name.
+    Stale entries keep being served while the handler is refreshed, and a refresh that fails
+    or comes back empty keeps the previous events instead of replacing them.
+    """
+
+    def __init__(self, event_handler: EventHandler,
+                 retry_interval: timedelta = timedelta(minutes=5),
+                 max_stale_age: timedelta = timedelta(days=3),
+                 default_refresh_interval: timedelta = timedelta(hours=12)):
+        self.event_handler = event_handler
+        self.RETRY_INTERVAL = retry_interval
+        self.MAX_STALE_AGE = max_stale_age
+        self.DEFAULT_REFRESH_INTERVAL = default_refresh_interval
+
+        self.entries: dict[str, SourceCacheEntry] = {}
+        self._lock = threading.Lock()
+
+    """
+    Get the cached events of a handler, however stale they are.
+    Args:
+        name (str): The handler name.
+    Returns:
+        list[Event]: The last good events, or an empty list if the handler was never fetched.
+    """
+    def get_events(self, name: str) -> list[Event]:
+        entry = self.entries.get(name)
+        return entry.events if entry is not None else []
+
+    """
+    Get the cached events of every handler.
+    Returns:
+        list[Event]: The combined last good events of every cached handler.
+    """
+    def get_all_events(self) -> list[Event]:
+        events = []
+        for entry in list(self.entries.values()):
+            events.extend(entry.events)
+        return events
+
+    """
+    Get a version of the cached events that is the same in every worker holding the same results.
+    Returns:
+        str: A hash of each handler's name and fetch time.
+    """
+    def get_version(self) -> str:
+        with self._lock:
+            fetched = sorted((name, entry.fetched_at.timestamp()) for name, entry in self.entries.items())
+        return hashlib.blake2b(repr(fetched).encode('utf-8'), digest_size=8).hexdigest()
+
+    """
+    Check whether a handler needs to be refreshed.
+    A handler is due when it was never fetched, when its events are older than its REFRESH_INTERVAL,
+    or when its last refresh failed and RETRY_INTERVAL has passed since.
+    Args:
+        handler: The location handler.
+        now (datetime): The current time.
+    Returns:
+        bool: True if the handler should be refreshed.
+    """
+    def is_due(self, handler, now: datetime) -> bool:
+        entry = self.entries.get(self.event_handler.get_handler_name(handler))
+        if entry is None:
+            return True
+        if entry.last_error is not None and now - entry.checked_at >= self.RETRY_INTERVAL:
+            return True
+        return entry.get_age(now) >= self.get_refresh_interval(handler)
+
+    """
+    Get the time at which a handler will next be due.
+    Args:
+        handler: The location handler.
+    Returns:
+        datetime: When the handler should next be refreshed.
+    """
+    def get_next_due_at(self, handler) -> datetime:
+        entry = self.entries.get(self.event_handler.get_handler_name(handler))
+        if entry is None:
+            return datetime.now()
+        next_due_at = entry.fetched_at + self.get_refresh_interval(handler)
+        if entry.last_error is not None:
+            next_due_at = min(next_due_at, entry.checked_at + self.RETRY_INTERVAL)
+        return next_due_at
+
+    """
+    Run the given handlers concurrently and store their results.
+    Args:
+        handlers (list): The location handlers to refresh.
+    """
+    def refresh(self, handlers: list) -> None:
+        results = self.event_handler.collect_location_events(handlers)
+        for handler in handlers:
+            name = self.event_handler.get_handler_name(handler)
+            if name in results:
+                self.store(name, results[name])
+            else:
+                self.reject(name, 'timed out')
+
+    """
+    Store the result of a handler run, keeping the previous events if the new result is empty.
+    An empty result replaces the previous events once they are older than MAX_STALE_AGE.
+    Args:
+        name (str): The handler name.
+        events (list[Event]): The events the handler returned.
+    """
+    def store(self, name: str, events: list[Event]) -> None:
+        now = datetime.now()
+        with self._lock:
+            entry = self.entries.get(name)
+            if events or entry is None or not entry.events or entry.get_age(now) >= self.MAX_STALE_AGE:
+                self.entries[name] = SourceCacheEntry(events, now)
+                return
+
+        print(f'{name} returned no events, keeping {len(entry.events)} events from {entry.fetched_at}')
+        self.reject(name, 'returned no events')
+
+    """
+    Record a failed handler run without touching its cached events, so it is retried after RETRY_INTERVAL.
+    Args:
+        name (str): The handler name.
+        reason (str): Why the run failed.
+    """
+    def reject(self, name: str, reason: str) -> None:
+        now = datetime.now()
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = SourceCacheEntry([], now)
+                self.entries[name] = entry
+            entry.checked_at = now
+            entry.last_error = reason
+
+    """
+    Replace entries with newer ones, such as entries loaded from a saved snapshot.
+    An entry is only replaced when the given one was checked more recently.
+    Args:
+        entries (dict[str, SourceCacheEntry]): The entries, keyed by handler name.
+    Returns:
+        list[str]: The names of the handlers whose entries were replaced.
+    """
+    def restore(self, entries: dict[str, SourceCacheEntry]) -> list[str]:
+        restored = []
+        with self._lock:
+            for name, entry in entries.items():
+                current = self.entries.get(name)
+                if current is None or entry.checked_at > current.checked_at:
+                    self.entries[name] = entry
+                    restored.append(name)
+        return restored
+
+    """
+    Get how often a handler should be refreshed.
+    Args:
+        handler: The location handler.
+    Returns:
+        timedelta: The handler's REFRESH_INTERVAL, or the cache default if it doesn't declare one.
+    """
+    def get_refresh_interval(self, handler) -> timedelta:
+        return getattr(handler, 'REFRESH_INTERVAL', self.DEFAULT_REFRESH_INTERVAL)
@@ -1,13 +1,14 @@
 import json
 from calendar import monthrange
-from models.Address import Address
 from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
 from utils.Web_Utils import post_body
+from utils.Metrics import record_parse_error
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 
 
 class Burnsville:
@@ -20,41 +21,36 @@ class Burnsville:
         That said, I do know that both events happen at the same time but only during on week days.
         Public skating events on Sundays will NOT coincide with Stick and Puck.
     """
-    def __init__(self):
-        address = Address(
-            street="251 Civic Center Parkway",
-            city="Burnsville",
-            state="MN",
-            zip_code="55337"
-        )
-        self.arena = Arena(
-            name="Burnsville Ice Center",
-            address=address
-        )
-        self.public_skating_cost = Cost(7.00)
-        self.developmental_ice_cost = Cost(11.00)
-        self.url = "https://burnsvillemn.gov/Admin/Facilities/Calendar/GetCalendarEvents"
+    def __init__(self, config: SourceConfig):
+        self.arena = config.get_arena()
+        self.public_skating_cost = config.get_cost('open_skate')
+        self.developmental_ice_cost = config.get_cost('stick_and_puck')
+        self.url = config.url
+        self.CALENDAR_ID = config.get_option('calendar_id', 149)
 
     """
-    Fetch events for the current from Burnsville Ice Center.
-    If there are 4 or fewer days left in the month, also fetch events for the next month.
+    Fetch events in the window from Burnsville Ice Center.
+    The window is sent to the calendar API as start and end epochs, so only events in it are returned.
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
-        list[Event]: A list of Event objects for the current and next month.
+        list[Event]: A list of Event objects in the window.
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
         print('Fetching Burnsville events...')
         events = []
 
-        current_date_epoch = self.get_epoch_for_today()
-        next_week_epoch = self.get_epoch_for_next_week()
+        start_epoch = self.convert_datetime_to_epoch(window.start)
+        end_epoch = self.convert_datetime_to_epoch(window.end)
 
         try:
-            post_body_text = '{"start": ' + str(current_date_epoch) + ',"end": ' + str(next_week_epoch) + ',"calIDs": 149}'
+            post_body_text = '{"start": ' + str(start_epoch) + ',"end": ' + str(end_epoch) + ',"calIDs": ' + str(self.CALENDAR_ID) + '}'
             response = post_body(self.url, post_body_text)
             json_response = json.loads(response)
-            events.extend(self.create_events_from_json_response(json_response))
+            events.extend(self.create_events_from_json_response(json_response, window))
         except Exception as e:
             print(f'Error fetching Burnsville events: {e}')
+            record_parse_error()
 
         return events
 
@@ -62,21 +58,25 @@ class Burnsville:
     Create Event objects from the JSON response.
     Args:
         json_response (list): The JSON response containing event data.
+        window (TimeWindow): The window to create events for; items outside it are skipped.
     Returns:
         list[Event]: A list of Event objects created from the JSON response.
     """
-    def create_events_from_json_response(self, json_response) -> list[Event]:
+    def create_events_from_json_response(self, json_response, window: TimeWindow) -> list[Event]:
         events = []
         for item in json_response:
             if item['title'] is not None and item['title'] != '':
                 event_title = item['title']
+                if event_title != 'Public Skating':
+                    continue
                 start_time = self.convert_event_item_timestamp_to_datetime(item['start'])
+                if not window.contains(start_time):
+                    continue
                 end_time = self.convert_event_item_timestamp_to_datetime(item['end'])
-                if event_title == 'Public Skating':
-                    event = self.create_event(EventType.OPEN_SKATE, self.public_skating_cost, start_time, end_time)
-                    events.append(event)
-                    if not self.is_date_sunday(start_time):
-                        event = self.create_event(EventType.STICK_AND_PUCK, self.developmental_ice_cost, start_time,
+                event = self.create_event(EventType.OPEN_SKATE, self.public_skating_cost, start_time, end_time)
+                events.append(event)
+                if not self.is_date_sunday(start_time):
+                    event = self.create_event(EventType.STICK_AND_PUCK, self.developmental_ice_cost, start_time,
                                               end_time)
                     events.append(event)
         return events
@@ -105,29 +105,15 @@ class Burnsville:
         return event
 
     """
-    Get the Unix epoch timestamp for today's date at midnight.
-    Returns:
-        int: The Unix epoch timestamp for today's date at midnight.
-    """
-    @staticmethod
-    def get_epoch_for_today() -> int:
-        start_of_today = datetime.now().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        return int(start_of_today.timestamp())
-
-    """
-    Get the Unix epoch timestamp for the date one week from today at midnight.
+    Get the Unix epoch timestamp for a date.
+    Args:
+        date (datetime): The date to convert.
     Returns:
-        int: The Unix epoch timestamp for the date one week from today at midnight.
+        int: The Unix epoch timestamp for the date.
     """
     @staticmethod
-    def get_epoch_for_next_week() -> int:
-        start_of_today = datetime.now().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        next_week = start_of_today + relativedelta(days=7)
-        return int(next_week.timestamp())
+    def convert_datetime_to_epoch(date: datetime) -> int:
+        return int(date.timestamp())
 
     """
     Convert an event item timestamp string to a datetime object.
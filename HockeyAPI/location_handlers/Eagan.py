@@ -1,83 +1,91 @@
-from models.Address import Address
 from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+from utils.Ics_Utils import iter_vevents, parse_datetime, unescape_text
 from utils.Web_Utils import fetch_body
-from ics import Calendar
-from datetime import datetime, timedelta
+from utils.Metrics import record_parse_error
+from datetime import datetime
 
 class Eagan():
     """
     Eagan Civic Center event handler
     """
-    def __init__(self):
-        address = Address(
-            street="3870 Pilot Knob Rd",
-            city="Eagan",
-            state="MN",
-            zip_code="55122"
-        )
-        self.arena = Arena(
-            name="Eagan Civic Center",
-            address=address
-        )
-        self.root_url = "https://cityofeagan.com/index.php?option=com_dpcalendar&task=ical.download&id="
-        self.civic_center_calendar_id = "934"
-        self.civic_center_calendar_url = self.root_url + self.civic_center_calendar_id
+    def __init__(self, config: SourceConfig):
+        self.arena = config.get_arena()
+        self.civic_center_calendar_url = config.url
+        self.OPEN_SKATE_DESCRIPTION = config.get_option('open_skate_description', "Open Skate - All Ages")
 
     """
     Fetch events from Eagan Civic Center calendar
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
         list[Event]: List of Event objects
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
         events = []
 
         try:
             website_body = fetch_body(self.civic_center_calendar_url)
-            calendar = Calendar(website_body)
-            events = self.parse_ics_to_events(calendar)
+            events = self.parse_ics_to_events(website_body, window)
         except Exception as e:
             print(f"Error fetching or parsing Eagan events: {e}")
+            record_parse_error()
 
         return events
 
     """
     Parse ICS calendar to extract events
+    The feed is read one VEVENT at a time. Events are skipped by the date in their raw DTSTART and by their raw
+    DESCRIPTION before any date, time or text is parsed, so only open skate events in the window are parsed.
     Args:
-        icalendar: Calendar object
+        ics_body (str): The iCalendar feed
+        window (TimeWindow): The window to parse events for; calendar events outside it are skipped.
     Returns:
         list[Event]: List of Event objects
     """
-    def parse_ics_to_events(self, calendar:Calendar) -> list[Event]:
+    def parse_ics_to_events(self, ics_body: str, window: TimeWindow) -> list[Event]:
         events = []
         print('Fetching Eagan Events...')
-        for event in calendar.events:
-            event_name = event.name.rstrip()
-            event_description = event.description.rstrip()
-            event_start = self.convert_to_datetime(event.begin.datetime)
-            event_end = self.convert_to_datetime(event.end.datetime)
-            if "Open Skate - All Ages" in event_description:
+        first_day = window.start.strftime("%Y%m%d")
+        last_day = window.end.strftime("%Y%m%d")
+        for vevent in iter_vevents(ics_body, ('DTSTART', 'DTEND', 'SUMMARY', 'DESCRIPTION')):
+            raw_start = vevent.get('DTSTART', ('', ''))[1].strip()
+            if not first_day <= raw_start[:8] <= last_day:
+                continue
+            raw_description = vevent.get('DESCRIPTION', ('', ''))[1]
+            if self.OPEN_SKATE_DESCRIPTION not in raw_description:
+                continue
 
-                cost = self.parse_cost_from_string(event_description)
-                cost = Cost(cost=cost)
+            event_start = parse_datetime(raw_start).replace(second=0)
+            if not window.contains(event_start):
+                continue
+            raw_end = vevent.get('DTEND', ('', ''))[1]
+            event_end = parse_datetime(raw_end).replace(second=0) if raw_end else event_start
+            event_name = unescape_text(vevent.get('SUMMARY', ('', ''))[1]).rstrip()
+            event_description = unescape_text(raw_description).rstrip()
 
-                event_notes = ""
-                if event_description != "":
-                    event_notes = event_description.replace('\n', ' - ')
-                else:
-                    event_notes = event_name
+            cost = self.parse_cost_from_string(event_description)
+            cost = Cost(cost=cost)
 
-                event = self.create_event(
-                    event_type=EventType.OPEN_SKATE,
-                    arena=self.arena,
-                    cost=cost,
-                    start_time=event_start,
-                    end_time=event_end,
-                    notes=event_notes
-                )
-                events.append(event)
+            event_notes = ""
+            if event_description != "":
+                event_notes = event_description.replace('\n', ' - ')
+            else:
+                event_notes = event_name
+
+            event = self.create_event(
+                event_type=EventType.OPEN_SKATE,
+                arena=self.arena,
+                cost=cost,
+                start_time=event_start,
+                end_time=event_end,
+                notes=event_notes
+            )
+            events.append(event)
 
         return events
 
@@ -138,14 +146,3 @@ class Eagan():
                 value = line.split(":")[1].strip().split("&")[0].strip().split("/")[0].strip().replace("$", "")
                 return value
         return value
-
-    """
-    Convert event datetime to standard datetime format
-    Args
-        event_datetime (datetime): Event datetime
-    Returns:
-        datetime: Standardized datetime object
-    """
-    @staticmethod
-    def convert_to_datetime(event_datetime: datetime) -> datetime:
-        return datetime(event_datetime.year, event_datetime.month, event_datetime.day, event_datetime.hour, event_datetime.minute)
\ No newline at end of file
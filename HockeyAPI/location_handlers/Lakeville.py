@@ -1,11 +1,14 @@
-import json
+from collections.abc import Iterator
 
 from models.Address import Address
 from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
-from utils.Web_Utils import fetch_body, get_query_selector
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+from utils.Web_Utils import fetch_body, iter_script_json_array
+from utils.Metrics import record_parse_error
 from datetime import datetime
 
 
@@ -13,55 +16,38 @@ class Lakeville:
     """
     Handler for Lakeville public skate and stick & puck events.
     """
-    def __init__(self):
-        self.root_url = "https://lakevillepublicopenskate.finnlyconnect.com/schedule/132"
-
-        self.cost = Cost(10.00)
-
-        ames_arena_address = Address(
-            street = "19900 Ipava Ave",
-            city = "Lakeville",
-            state = "MN",
-            zip_code = "55044"
-        )
-        self.lakeview_bank_rink = Arena(
-            name="Ames Arena - Lakeview Bank Rink",
-            address=ames_arena_address,
-        )
-
-        self.genz_ryan_rink = Arena(
-            name="Ames Arena - Lakeview Bank Rink",
-            address=ames_arena_address
-        )
-
-        hasse_arena_address = Address(
-            street = "8525 215th St W",
-            city = "Lakeville",
-            state = "MN",
-            zip_code = "55044"
-        )
-        self.hasse_arena = Arena(
-            name="Hasse Arena",
-            address=hasse_arena_address
-        )
+    def __init__(self, config: SourceConfig):
+        self.root_url = config.url
+        self.open_skate_cost = config.get_cost('open_skate')
+        self.stick_and_puck_cost = config.get_cost('stick_and_puck')
+        # Arenas are keyed by the schedule's facility name, e.g. "3.Hasse Arena"
+        self.arenas = config.arenas
 
     """
     Fetches public skate and stick & puck events from Lakeville's online schedule.
+    Schedule items outside the window are skipped by comparing their ISO timestamps before anything is parsed.
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
         list[Event]: A list of Event objects representing the fetched events.
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
         print('Fetching Lakeville events...')
         events = []
+        window_start = window.start.strftime("%Y-%m-%dT%H:%M:%S")
+        window_end = window.end.strftime("%Y-%m-%dT%H:%M:%S")
 
         try:
             online_schedule_json = self.get_json_objects_from_site()
 
             for online_schedule in online_schedule_json:
                 # print('Online Schedule: {}'.format(online_schedule))
+                start_time = online_schedule['EventStartTime']
+                if not window_start <= start_time <= window_end:
+                    continue
+
                 facility_name = online_schedule['FacilityName']
                 event_name = online_schedule['AccountName']
-                start_time = online_schedule['EventStartTime']
                 end_time = online_schedule['EventEndTime']
                 start_datetime_object = datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
                 end_datetime_object = datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
@@ -69,62 +55,44 @@ class Lakeville:
 
                 if event_name == "PUBLIC STICK & PUCK - ALL AGES":
                     arena = self.create_arena(facility_name)
-                    event = self.create_event(EventType.STICK_AND_PUCK, arena, self.cost, start_datetime_object, end_datetime_object, event_notes)
+                    event = self.create_event(EventType.STICK_AND_PUCK, arena, self.stick_and_puck_cost, start_datetime_object, end_datetime_object, event_notes)
                     events.append(event)
                 elif event_name == "PUBLIC OPEN SKATING":
                     arena = self.create_arena(facility_name)
-                    event = self.create_event(EventType.OPEN_SKATE, arena, self.cost, start_datetime_object, end_datetime_object, event_notes)
+                    event = self.create_event(EventType.OPEN_SKATE, arena, self.open_skate_cost, start_datetime_object, end_datetime_object, event_notes)
                     events.append(event)
         except Exception as e:
             print(f'Error fetching Lakeville events: {e}')
+            record_parse_error()
 
         return events
 
     """
-    Extracts JSON objects from the Lakeville online schedule webpage.
+    Extracts the online schedule JSON objects from the Lakeville online schedule webpage.
+    Only the `_onlineScheduleList` array in the page's scripts is decoded, one schedule item at a time.
     Returns:
-        dict: A dictionary containing the extracted JSON objects.
+        Iterator[dict]: The online schedule items.
     """
-    def get_json_objects_from_site(self) -> dict:
-        facility_json = {}
-        event_type_json = {}
-        online_schedule_json = {}
-
+    def get_json_objects_from_site(self) -> Iterator[dict]:
         website_body = fetch_body(self.root_url)
-        script_bodies = get_query_selector(website_body, 'script')
-        for script_body in script_bodies:
-            script_string = str(script_body.string)
-            if "eventTypeResourceList" in script_string:
-                for line in script_string.splitlines():
-                    # if "_facilityList = " in line:
-                    #     facility_json = get_facility_json(line)
-                    # if "_eventTypeList = " in line:
-                    #     event_type_json = get_event_type_json(line)
-                    if "_onlineScheduleList = " in line:
-                        online_schedule_json = self.get_online_schedule_json(line)
-
-        return online_schedule_json
+        return iter_script_json_array(website_body, '_onlineScheduleList')
 
     """
     Creates an Arena object based on the facility name.
     Args:
         facility_name (str): The name of the facility.
     Returns:
-        Arena: The corresponding Arena object.
+        Arena: The arena configured for the facility, or an unknown rink arena if there is none.
     """
     def create_arena(self, facility_name:str) -> Arena:
-        if facility_name == "1.Ames Arena-Lakeview Bank Rink":
-            return self.lakeview_bank_rink
-        elif facility_name == "2.Ames Arena-Genz-Ryan Rink":
-            return self.genz_ryan_rink
-        elif facility_name == "3.Hasse Arena":
-            return self.hasse_arena
-        else:
-            return Arena(
+        arena = self.arenas.get(facility_name)
+        if arena is None:
+            arena = Arena(
                 name=facility_name,
-                address="",
+                address=Address(street="", city="Lakeville", state="MN", zip_code=""),
                 notes="Unknown rink facility"
             )
+        return arena
 
     """
     Creates an Event object with the provided details.
@@ -150,47 +118,6 @@ class Lakeville:
         )
         return event
 
-    """
-    Converts a JSON string to a dictionary.
-    Args:
-        json_string (str): The JSON string to convert.
-    Returns:
-        dict: The converted dictionary.
-    """
-    @staticmethod
-    def convert_string_to_json(json_string: str) -> dict:
-        return json.loads(json_string)
-
-    """
-    Extracts the online schedule JSON from the provided string.
-    Args:
-        online_schedule_list_string (str): The string containing the online schedule JSON.
-    Returns:
-        dict: The extracted online schedule JSON.
-    """
-    def get_online_schedule_json(self, online_schedule_list_string: str) -> dict:
-        return self.convert_string_to_json(online_schedule_list_string.split(' = ')[1].rstrip(';'))
-
-    """
-    Extracts the event type JSON from the provided string.
-    Args:
-        event_type_list_string (str): The string containing the event type JSON.
-    Returns:
-        dict: The extracted event type JSON.
-    """
-    def get_event_type_json(self, event_type_list_string: str) -> dict:
-        return self.convert_string_to_json(event_type_list_string.split(' = ')[1].rstrip(';'))
-
-    """
-    Extracts the facility JSON from the provided string.
-    Args:
-        facility_list_string (str): The string containing the facility JSON.
-    Returns:
-        dict: The extracted facility JSON.
-    """
-    def get_facility_json(self, facility_list_string: str) -> dict:
-        return self.convert_string_to_json(facility_list_string.split(' = ')[1].rstrip(';'))
-
     """
     Retrieves the facility name based on the provided facility ID.
     Args:
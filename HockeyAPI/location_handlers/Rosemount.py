@@ -1,46 +1,55 @@
-from models.Address import Address
 from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
 from utils.Web_Utils import fetch_content
+from utils.Metrics import record_parse_error
 from datetime import datetime, timedelta
+import calendar
+import hashlib
 import pdfplumber
 import io
+import re
+import threading
+
+MONTH_NUMBERS = {calendar.month_name[month].lower(): month for month in range(1, 13)}
+CALENDAR_HEADING_PATTERN = re.compile(rf"\b({'|'.join(calendar.month_name[1:])})\s+(\d{{4}})\b", re.IGNORECASE)
 
 class Rosemount:
     """
     Handler for Rosemount Ice Arena open skate events.
     """
-    def __init__(self) -> None:
-        self.root_url = "https://www.rosemountmn.gov/DocumentCenter/View/4845/2025-December-Arena-Events"
+    def __init__(self, config: SourceConfig) -> None:
+        self.root_url = config.url
+        self.HEADING_HEIGHT_FRACTION = 0.2
 
-        self.standard_cost = Cost(2.00)
-        self.vacation_cost = Cost(6.00)
+        self._pdf_cache_lock = threading.Lock()
+        self._pdf_digest: str | None = None
+        self._page_months: list[tuple[int, int] | None] | None = None
+        self._page_tables: dict[int, list] = {}
 
-        address = Address(
-            street = "13885 South Robert Trail",
-            city = "Rosemount",
-            state = "MN",
-            zip_code = "55068"
-        )
-        self.rosemount_ice_arena = Arena(
-            name="Rosemount Ice Arena",
-            address=address
-        )
+        self.standard_cost = config.get_cost('open_skate')
+        self.vacation_cost = config.get_cost('vacation_open_skate')
+
+        self.rosemount_ice_arena = config.get_arena()
 
     """
     Fetch and parse open skate events from the Rosemount Ice Arena PDF calendar.
+    Each calendar page's month is found from the month heading at the top of the page, and only the tables of pages
+    whose month the window overlaps are extracted. Headings and tables are cached for the PDF's content hash, so an
+    unchanged PDF isn't parsed again.
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
         list[Event]: A list of Event objects representing open skate sessions.
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
         events = []
 
         try:
-            current_date = datetime.now()
-            current_year = current_date.year
-            current_month = current_date.strftime("%B")
+            target_months = set(window.get_months())
 
             # You can tell the day by the first line in the cell.
             # e.x. "Cell: 14"
@@ -51,57 +60,110 @@ class Rosemount:
             # Also note: when the cell crosses into the next month, the day number will contain a slash (e.x. "Cell: 1/1" for Jan 1st) and you'll need to account for year flips
 
             pdf_data_bytes = fetch_content(self.root_url)
-            pdf_stream = io.BytesIO(pdf_data_bytes)
-            with pdfplumber.open(pdf_stream) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if self.validate_calendar_page(page_text, current_month, current_year):
-                        tables = page.extract_table()
-                        events = self.extract_events_from_pdf_table(tables=tables)
+            for year, month, tables in self.get_calendar_tables(pdf_data_bytes, target_months):
+                events.extend(self.extract_events_from_pdf_table(tables, month, year, window))
         except Exception as e:
             print(f"An error occurred while fetching Rosemount events: {e}")
+            record_parse_error()
 
         return events
 
     """
-    Validate if the PDF page corresponds to the target month and year.
+    Get the tables of every calendar page for the target months, from the cache when the PDF is unchanged.
+    The PDF is only opened when a target month's page hasn't been parsed yet.
+    Args:
+        pdf_data_bytes (bytes): The PDF content.
+        target_months (set[tuple[int, int]]): The (year, month) of each month to get pages for.
+    Returns:
+        list[tuple[int, int, list]]: The year, month and table of each matching page, in page order.
+    """
+    def get_calendar_tables(self, pdf_data_bytes: bytes, target_months: set[tuple[int, int]]) -> list[tuple[int, int, list]]:
+        pdf_digest = hashlib.sha256(pdf_data_bytes).hexdigest()
+        with self._pdf_cache_lock:
+            if pdf_digest != self._pdf_digest:
+                self._pdf_digest = pdf_digest
+                self._page_months = None
+                self._page_tables = {}
+
+            pages_to_parse = None
+            if self._page_months is not None:
+                pages_to_parse = [index for index, month in enumerate(self._page_months)
+                                  if month in target_months and index not in self._page_tables]
+            if pages_to_parse is None or pages_to_parse:
+                with pdfplumber.open(io.BytesIO(pdf_data_bytes)) as pdf:
+                    if self._page_months is None:
+                        self._page_months = self.find_page_months(pdf.pages)
+                        pages_to_parse = [index for index, month in enumerate(self._page_months)
+                                          if month in target_months]
+                    for index in pages_to_parse:
+                        self._page_tables[index] = pdf.pages[index].extract_table() or []
+
+            return [(page_month[0], page_month[1], self._page_tables[index])
+                    for index, page_month in enumerate(self._page_months) if page_month in target_months]
+
+    """
+    Find the calendar month of each page from the first month named in its heading, without extracting the text of
+    whole pages. Only a page whose heading names no month has its full text searched instead.
+    A page holds a single calendar, so later month names, such as a note about next month, are ignored.
+    Args:
+        pages (list[pdfplumber.page.Page]): The PDF pages.
+    Returns:
+        list[tuple[int, int] | None]: The (year, month) of the calendar on each page, or None if none was found.
+    """
+    def find_page_months(self, pages: list) -> list[tuple[int, int] | None]:
+        page_months = []
+        for page in pages:
+            heading = page.crop((0, 0, page.width, page.height * self.HEADING_HEIGHT_FRACTION))
+            page_month = self.find_calendar_month(heading.extract_text() or "")
+            if page_month is None:
+                page_month = self.find_calendar_month(page.extract_text() or "")
+            page_months.append(page_month)
+        return page_months
+
+    """
+    Find the first "<Month> <Year>" calendar heading in a text.
     Args:
-        page_text (str): The text content of the PDF page.
-        month (str): The target month (e.g., "December").
-        year (int): The target year (e.g., 2025).
+        text (str): The text to search (e.g., "December 2025").
     Returns:
-        bool: True if the page contains the target month and year, False otherwise.
+        tuple[int, int] | None: The (year, month) of the first heading found, or None if there is none.
     """
     @staticmethod
-    def validate_calendar_page(page_text, month, year) -> bool:
-        target_string = f"{month} {year}"
-        return target_string in page_text
+    def find_calendar_month(text: str) -> tuple[int, int] | None:
+        match = CALENDAR_HEADING_PATTERN.search(text)
+        if match is None:
+            return None
+        month_name, year = match.groups()
+        return int(year), MONTH_NUMBERS[month_name.lower()]
 
     """
     Extract open skate events from the PDF table data.
+    Cells for days outside the window are skipped before their times are parsed.
     Args:
         tables (list): The table data extracted from the PDF page.
+        month (int): The month number of the calendar page.
+        year (int): The year of the calendar page.
+        window (TimeWindow): The window to extract events for.
     Returns:
         list[Event]: A list of Event objects representing open skate sessions.
     """
-    def extract_events_from_pdf_table(self, tables: list) -> list[Event]:
+    def extract_events_from_pdf_table(self, tables: list, month: int, year: int, window: TimeWindow) -> list[Event]:
         events = []
-        current_date = datetime.now()
-        current_month_number = current_date.month
         for row in tables:
             for cell in row:
                 if "Open Skate" in str(cell):
                     cell_lines = str(cell).split("\n")
+                    day_of_month_part = cell_lines[0]
+                    if not window.contains_day(self.parse_day_string(day_of_month_part, month, year)):
+                        continue
                     for index, line in enumerate(cell_lines):
                         if "Open Skate" in line:
                             event_name = line.strip()
-                            day_of_month_part = cell_lines[0]
                             time_string = cell_lines[index + 1]
                             start_time, end_time = self.parse_time_string(
                                 time_string=time_string,
                                 day_string=day_of_month_part,
-                                month=current_month_number,
-                                year=current_date.year
+                                month=month,
+                                year=year
                             )
                             if "Vacation" in event_name:
                                 cost = self.vacation_cost
@@ -133,19 +195,35 @@ class Rosemount:
         start_time_str = time_parts[0]
         end_time_str = time_parts[1]
 
+        day = self.parse_day_string(day_string, month, year)
+
+        start_time = self.convert_to_24_hour_format(start_time_str, day.day, day.month, day.year)
+        end_time = self.convert_to_24_hour_format(end_time_str, day.day, day.month, day.year)
+
+        return start_time, end_time
+
+    """
+    Parse the day part of a calendar cell into a date.
+    Args:
+        day_string (str): The day part string (e.g., "14", or "1/1" for a day of the next month).
+        month (int): The month number of the calendar page.
+        year (int): The year of the calendar page.
+    Returns:
+        datetime: The date of the cell, moved into the next year when the cell's month wraps around.
+    """
+    @staticmethod
+    def parse_day_string(day_string: str, month: int, year: int) -> datetime:
         if "/" in day_string:
             day_parts = day_string.split("/")
             day = int(day_parts[1])
-            month = int(day_parts[0])
-            if month <  month:
+            day_month = int(day_parts[0])
+            if day_month < month:
                 year += 1
+            month = day_month
         else:
             day = int(day_string)
 
-        start_time = self.convert_to_24_hour_format(start_time_str, day, month, year)
-        end_time = self.convert_to_24_hour_format(end_time_str, day, month, year)
-
-        return start_time, end_time
+        return datetime(year, month, day)
 
     """
     Create an Event object for the open skate session.
@@ -1,73 +1,72 @@
-from models.Address import Address
 from models.Arena import Arena
 from enums.Event_Type import EventType
 from models.Cost import Cost
 from models.Event import Event
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-from utils.Web_Utils import fetch_body, get_query_selector
+from models.SourceConfig import SourceConfig
+from models.TimeWindow import TimeWindow
+from datetime import datetime
+from utils.Web_Utils import fetch_body, get_query_selector, parse_html
+from utils.Metrics import record_parse_error
 
 
 class SouthStPaul():
     """
     Handler for South St Paul Doug Woog Arena open skate events.
     """
-    def __init__(self):
-        address = Address(
-            street = "141 6th St S",
-            city = "South St Paul",
-            state = "MN",
-            zip_code = "55075"
-        )
-        self.arena = Arena(
-            name="Doug Woog Arena",
-            address=address,
-            notes="$5 per person, $20 punch pass - 5 open skate sessions, $40 punch pass - 10 open skate sessions"
-        )
-
-        self.cost = Cost(5.00)
+    def __init__(self, config: SourceConfig):
+        self.arena = config.get_arena()
+        self.cost = config.get_cost('open_skate')
+        self.stick_and_puck_cost = config.get_cost('stick_and_puck')
 
-        self.root_url = "https://www.southstpaul.org/calendar.aspx?CID=26,27"
+        self.root_url = config.url
 
     """
     Fetch and parse open skate events from the South St Paul calendar.
+    Only the calendar months the window overlaps are fetched.
+    Args:
+        window (TimeWindow): The window to fetch events for.
     Returns:
         list[Event]: A list of Event objects representing open skate sessions.
     """
-    def get_events(self) -> list[Event]:
+    def get_events(self, window: TimeWindow) -> list[Event]:
         print('Fetching South St Paul events...')
         events = []
 
         try:
-            current_date = datetime.now()
-            events = self.get_events_from_calendar(current_date)
-            next_month = current_date + relativedelta(months=1)
-            events.extend(self.get_events_from_calendar(next_month))
+            for year, month in window.get_months():
+                events.extend(self.get_events_from_calendar(datetime(year, month, 1), window))
         except Exception as e:
             print(f"An error occurred while fetching South St Paul events: {e}")
+            record_parse_error()
 
         return events
 
     """
     Parse events from the South St Paul calendar for a given month.
+    Calendar items that aren't skating sessions, or fall outside the window, are skipped before their times are parsed.
     Args:
         current_date (datetime): The date representing the month to fetch events for.
+        window (TimeWindow): The window to parse events for.
     Returns:
         list[Event]: A list of Event objects for the specified month.
     """
-    def get_events_from_calendar(self, current_date: datetime) -> list[Event]:
+    def get_events_from_calendar(self, current_date: datetime, window: TimeWindow) -> list[Event]:
         events = []
 
         try:
             current_month = current_date.month
             current_year = current_date.year
             website_body = fetch_body(self.root_url + f"&month={current_month}&year={current_year}")
-            calendar_body = get_query_selector(website_body, '.monthItem ')
+            calendar_body = get_query_selector(parse_html(website_body, class_name='monthItem'), '.monthItem')
             for calendar_item in calendar_body:
                 event_name = calendar_item.select("a > span")[0].get_text()
-                event_time_string = calendar_item.select(".tooltipInner")[0].select("div > dl > dd")[0].get_text()
+                if event_name not in ["Open Skate Session", "Stick & Puck Session", "Stick and Puck Session"]:
+                    continue
                 event_date_string = calendar_item.select(".tooltipInner")[0].select("a")[0].get('href')
                 event_date = self.parse_event_date_string(event_date_string)
+                if not window.contains_day(event_date):
+                    continue
+                event_time_string = calendar_item.select(".tooltipInner")[0].select("div > dl > dd")[0].get_text()
                 event_start_time, event_end_time = self.parse_event_time_string(event_date, event_time_string)
                 # print(f'Found event name: {event_name} from: {event_start_time} to {event_end_time}')
                 if event_name in ["Open Skate Session"]:
@@ -78,6 +77,7 @@ class SouthStPaul():
                     events.append(event)
         except Exception as e:
             print(f"An error occurred while parsing South St Paul calendar events: {e}")
+            record_parse_error()
 
         return events
 
@@ -97,7 +97,7 @@ class SouthStPaul():
             arena=self.arena,
             start_time=start_time,
             end_time=end_time,
-            cost=self.cost,
+            cost=self.stick_and_puck_cost if event_type == EventType.STICK_AND_PUCK else self.cost,
             notes=notes
         )
         return event
@@ -1,18 +1,23 @@
 class Address:
     """
     A class representing a physical address with street, city, state, and zip code.
+    Addresses are immutable, so the formatted address string and hash are computed once.
     """
+    __slots__ = ('street', 'city', 'state', 'zip_code', '_address_string', '_hash')
+
     def __init__(self, street: str, city: str, state: str, zip_code: str):
-        self.street = street
-        self.city = city
-        self.state = state
-        self.zip_code = zip_code
+        object.__setattr__(self, 'street', street)
+        object.__setattr__(self, 'city', city)
+        object.__setattr__(self, 'state', state)
+        object.__setattr__(self, 'zip_code', zip_code)
+        object.__setattr__(self, '_address_string', f"{street}, {city}, {state} {zip_code}")
+        object.__setattr__(self, '_hash', hash(self._address_string))
 
     """
     Returns the full address as a formatted string.
     """
     def get_address_string(self) -> str:
-        return f"{self.street}, {self.city}, {self.state} {self.zip_code}"
+        return self._address_string
 
     """
     Returns the city name from the address.
@@ -20,6 +25,23 @@ class Address:
     def get_city_name(self) -> str:
         return self.city
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Address is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Address is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return Address, (self.street, self.city, self.state, self.zip_code)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Address):
+            return NotImplemented
+        return self._address_string == other._address_string
+
+    def __hash__(self) -> int:
+        return self._hash
+
     def __repr__(self):
         return (f"Address(street='{self.street}', city='{self.city}', "
-                f"state='{self.state}', zip_code='{self.zip_code}'')")
\ No newline at end of file
+                f"state='{self.state}', zip_code='{self.zip_code}'')")
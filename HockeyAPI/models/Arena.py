@@ -1,3 +1,5 @@
+import sys
+import threading
 from functools import total_ordering
 from models.Address import Address
 
@@ -6,25 +8,57 @@ from models.Address import Address
 class Arena:
     """
     A class representing a sports arena with attributes for name, address, and notes.
+    Arenas are immutable and can be shared between events. Use with_notes to get the arena with per-event notes,
+    such as the rink or sub-facility, which is interned so every event at the same rink shares one instance.
     Attributes:
         name (str): The name of the arena.
-        address (str): The physical address of the arena.
+        address (Address): The physical address of the arena.
         notes (str): Additional notes about the arena.
+        key (tuple): The (name, address, notes) the arena is compared, ordered and hashed by.
     """
+    __slots__ = ('name', 'address', 'notes', 'key', '_hash')
     name: str
 
+    _interned: dict[tuple, 'Arena'] = {}
+    _interned_lock = threading.Lock()
+
     def __init__(self, name: str, address: Address, notes: str = ""):
-        self.name = name
-        self.address = address
-        self.notes = notes
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'address', address)
+        object.__setattr__(self, 'notes', notes)
+        object.__setattr__(self, 'key', (name, address.get_address_string(), notes))
+        object.__setattr__(self, '_hash', hash(self.key))
 
     """
-    Set the notes for the arena.
+    Get the arena with different notes. Location handlers can call this concurrently.
     Args:
-        notes (str): The notes to set for the arena.
+        notes (str): The notes of the arena.
+    Returns:
+        Arena: This arena if the notes are unchanged, otherwise the interned arena with the same name, address
+        and notes.
+    """
+    def with_notes(self, notes: str) -> 'Arena':
+        if notes == self.notes:
+            return self
+        interned = Arena._interned.get((self.name, self.address.get_address_string(), notes))
+        if interned is not None:
+            return interned
+        return Arena.intern(Arena(self.name, self.address, sys.intern(notes)))
+
     """
-    def set_notes(self, notes: str):
-        self.notes = notes
+    Get the shared instance of an arena, registering it if no equal arena was interned yet.
+    Args:
+        arena (Arena): The arena.
+    Returns:
+        Arena: The interned arena equal to the given one.
+    """
+    @staticmethod
+    def intern(arena: 'Arena') -> 'Arena':
+        interned = Arena._interned.get(arena.key)
+        if interned is not None:
+            return interned
+        with Arena._interned_lock:
+            return Arena._interned.setdefault(arena.key, arena)
 
     """
     Get the address of the arena as a string.
@@ -43,29 +77,29 @@ class Arena:
         return self.address.get_city_name()
 
     """
-    Comparison methods to allow sorting arenas by name.
+    Comparison methods to allow sorting arenas by name, then address and notes.
     Args:
         other (Arena): Another arena to compare with.
     Returns:
-        bool: True if this arena's name is less than/equal to the other arena's name.
+        bool: True if this arena sorts before the other arena.
     """
     def __lt__(self, other) -> bool:
         if not isinstance(other, Arena):
             return NotImplemented
 
-        return self.name < other.name
+        return self.key < other.key
 
     """
-    Equality method to compare arenas by name.
+    Equality method to compare arenas by name, address and notes.
     Args:
         other (Arena): Another arena to compare with.
     Returns:
-        bool: True if the arena names are equal.
+        bool: True if the arenas are equal.
     """
     def __eq__(self, other) -> bool:
         if not isinstance(other, Arena):
             return NotImplemented
-        return self.name == other.name
+        return self is other or self.key == other.key
 
     """
     Check if an instance is of type Arena.
@@ -86,9 +120,32 @@ class Arena:
         return f"Arena(Name: {self.name}, Address: {self.get_address()}, Notes: {self.notes})"
 
     """
-    Hash method to allow using Arena instances in sets and as dictionary keys.
+    Hash method to allow using Arena instances in sets and as dictionary keys. The hash is computed once.
     Returns:
         int: The hash value of the Arena instance.
     """
     def __hash__(self) -> int:
-        return hash((self.name, self.address.get_address_string(), self.notes))
\ No newline at end of file
+        return self._hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Arena is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Arena is immutable, cannot delete '{name}'")
+
+    # Unpickled arenas are interned, so events loaded from a snapshot share one instance per rink
+    def __reduce__(self):
+        return Arena.unpickle, (self.name, self.address, self.notes)
+
+    """
+    Rebuild a pickled arena.
+    Args:
+        name (str): The name of the arena.
+        address (Address): The physical address of the arena.
+        notes (str): Additional notes about the arena.
+    Returns:
+        Arena: The interned arena.
+    """
+    @staticmethod
+    def unpickle(name: str, address: Address, notes: str) -> 'Arena':
+        return Arena.intern(Arena(name, address, sys.intern(notes)))
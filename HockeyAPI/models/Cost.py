@@ -1,29 +1,15 @@
 class Cost:
     """
-    Class to represent the cost associated with an event.
+    Class to represent the cost associated with an event. Costs are immutable and shared between events.
     Attributes:
         cost (float): The monetary cost of the event.
         notes (str): Additional notes regarding the cost.
     """
-    def __init__(self, cost: float = 0.0, notes: str = ""):
-        self.cost = cost
-        self.notes = notes
-
-    """
-    Set the cost of the event.
-    Args:
-        cost (float): The monetary cost to set for the event.
-    """
-    def set_cost(self, cost: float) -> None:
-        self.cost = cost
+    __slots__ = ('cost', 'notes')
 
-    """
-    Set additional notes regarding the cost.
-    Args:
-        notes (str): The notes to set regarding the cost.
-    """
-    def add_notes(self, notes: str) -> None:
-        self.notes = notes
+    def __init__(self, cost: float = 0.0, notes: str = ""):
+        object.__setattr__(self, 'cost', cost)
+        object.__setattr__(self, 'notes', notes)
 
     """
     Get the cost of the event.
@@ -39,4 +25,24 @@ class Cost:
         str: The notes regarding the cost.
     """
     def get_notes(self) -> str:
-        return self.notes
\ No newline at end of file
+        return self.notes
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Cost is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Cost is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return Cost, (self.cost, self.notes)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Cost):
+            return NotImplemented
+        return self.cost == other.cost and self.notes == other.notes
+
+    def __hash__(self) -> int:
+        return hash((self.cost, self.notes))
+
+    def __repr__(self):
+        return f"Cost(cost={self.cost}, notes='{self.notes}')"
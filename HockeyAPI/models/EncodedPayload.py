@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class EncodedPayload:
+    """
+    A JSON response body serialized once and stored alongside its gzip and brotli compressed forms,
+    so every request for it is served from bytes without encoding or compressing it again.
+    Brotli is skipped when the brotli package is not installed.
+    Attributes:
+        digest (str): A hash of the uncompressed body, shared by every encoding.
+        bodies (dict[str, bytes]): The body keyed by content coding, with 'identity' for the uncompressed body.
+    """
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 9
+    ENCODINGS = ('br', 'gzip')
+
+    def __init__(self, body: bytes, digest: str | None = None):
+        self.digest = digest if digest is not None else self.get_digest(body)
+        self.bodies: dict[str, bytes] = {'identity': body}
+        self.bodies['gzip'] = gzip.compress(body, compresslevel=self.GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body, quality=self.BROTLI_QUALITY)
+
+    """
+    Serialize a JSON-ready value the way Flask's jsonify does, then encode it.
+    Args:
+        data: The value to serialize.
+        previous (EncodedPayload, optional): A payload to reuse, without compressing again, if the body is unchanged.
+    Returns:
+        EncodedPayload: The payload.
+    """
+    @staticmethod
+    def from_json(data, previous: 'EncodedPayload | None' = None) -> 'EncodedPayload':
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        digest = EncodedPayload.get_digest(body)
+        if previous is not None and previous.digest == digest:
+            return previous
+        return EncodedPayload(body, digest)
+
+    """
+    Get the content hash of a body.
+    Args:
+        body (bytes): The uncompressed body.
+    Returns:
+        str: The hex digest.
+    """
+    @staticmethod
+    def get_digest(body: bytes) -> str:
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    """
+    Pick the best available encoding for a request's Accept-Encoding header.
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): The parsed Accept-Encoding header.
+    Returns:
+        str: 'br', 'gzip' or 'identity'.
+    """
+    def choose_encoding(self, accept_encodings) -> str:
+        best_encoding = 'identity'
+        best_quality = 0
+        for encoding in self.ENCODINGS:
+            quality = accept_encodings[encoding]
+            if encoding in self.bodies and quality > best_quality:
+                best_encoding, best_quality = encoding, quality
+        return best_encoding
+
+    """
+    Get the strong ETag of the body in an encoding. Each encoding is a different representation, so gets its own tag.
+    Args:
+        encoding (str): The content coding.
+    Returns:
+        str: The unquoted ETag.
+    """
+    def get_etag(self, encoding: str) -> str:
+        return self.digest if encoding == 'identity' else f'{self.digest}-{encoding}'
@@ -8,6 +8,7 @@ from models.Cost import Cost
 class Event:
     """
     Represents an event at an arena.
+    Events are immutable, so their sort key and hash are computed once when they are created.
     Attributes:
         event_type (EventType): The type of the event.
         arena (Arena): The arena where the event takes place.
@@ -15,7 +16,10 @@ class Event:
         end_time (datetime): The end time of the event.
         cost (Cost): The cost associated with the event.
         notes (str): Additional notes about the event.
+        sort_key (tuple): Start time, arena name, event type, end time, cost, arena address, arena notes and notes.
+            Events are ordered, compared and hashed by it.
     """
+    __slots__ = ('event_type', 'arena', 'start_time', 'end_time', 'cost', 'notes', 'sort_key', '_hash')
     start_time: datetime
     arena: Arena
     event_type: EventType
@@ -23,12 +27,15 @@ class Event:
     cost: Cost
 
     def __init__(self, event_type: EventType, arena: Arena, start_time: datetime, end_time: datetime, cost: Cost, notes: str = "") -> None:
-        self.event_type = event_type
-        self.arena = arena
-        self.start_time = start_time
-        self.end_time = end_time
-        self.cost = cost
-        self.notes = notes
+        object.__setattr__(self, 'event_type', event_type)
+        object.__setattr__(self, 'arena', arena)
+        object.__setattr__(self, 'start_time', start_time)
+        object.__setattr__(self, 'end_time', end_time)
+        object.__setattr__(self, 'cost', cost)
+        object.__setattr__(self, 'notes', notes)
+        object.__setattr__(self, 'sort_key', (start_time, arena.name, event_type.value, end_time, cost.get_cost(),
+                                              arena.get_address(), arena.notes, notes))
+        object.__setattr__(self, '_hash', hash(self.sort_key))
 
     """
     Comparison methods to allow sorting events by multiple attributes.
@@ -42,19 +49,7 @@ class Event:
         if not isinstance(other, Event):
             return NotImplemented
 
-        if self.start_time != other.start_time:
-            return self.start_time < other.start_time
-
-        if self.arena != other.arena:
-            return self.arena < other.arena
-
-        if self.event_type != other.event_type:
-            return self.event_type.value < other.event_type.value
-
-        if self.end_time != other.end_time:
-            return self.start_time < other.start_time
-
-        return self.cost.get_cost() < other.cost.get_cost()
+        return self.sort_key < other.sort_key
 
     """
     Equality method to compare events by multiple attributes.
@@ -67,11 +62,7 @@ class Event:
         if not isinstance(other, Event):
             return NotImplemented
 
-        return (self.start_time == other.start_time and
-                self.arena == other.arena and
-                self.event_type == other.event_type and
-                self.end_time == other.end_time and
-                self.cost.get_cost() == other.cost.get_cost())
+        return self is other or (self._hash == other._hash and self.sort_key == other.sort_key)
 
     """
     String representation of the Event object in JSON-like format.
@@ -79,12 +70,21 @@ class Event:
         str: A string representation of the Event.
      """
     def __str__(self) -> str:
-        return f'{{"event_type": "{self.event_type.name}", "arena": {{"name": "{self.arena.name}", "address": "{self.arena.address}", "notes": "{self.arena.notes}"}}, "start_time": "{self.start_time.strftime("%Y-%m-%d %H:%M")}", "end_time": "{self.end_time.strftime("%Y-%m-%d %H:%M")}", "cost": {{"adult_cost": {self.cost.adult_cost}, "child_cost": {self.cost.child_cost}}}}}'
+        return f'{{"event_type": "{self.event_type.name}", "arena": {{"name": "{self.arena.name}", "address": "{self.arena.address}", "notes": "{self.arena.notes}"}}, "start_time": "{self.start_time.strftime("%Y-%m-%d %H:%M")}", "end_time": "{self.end_time.strftime("%Y-%m-%d %H:%M")}", "cost": {{"cost": {self.cost.cost}}}}}'
 
     """
-    Hash method to allow using Event instances in sets and as dictionary keys.
+    Hash method to allow using Event instances in sets and as dictionary keys. The hash is computed once.
     Returns:
         int: The hash value of the Event instance.
     """
     def __hash__(self) -> int:
-        return hash((self.event_type, self.arena, self.start_time, self.end_time, self.cost.get_cost(), self.notes))
\ No newline at end of file
+        return self._hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Event is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Event is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return Event, (self.event_type, self.arena, self.start_time, self.end_time, self.cost, self.notes)
@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, time, timedelta
+from enums.Event_Type import EventType
+from models.TimeWindow import TimeWindow
+
+
+class EventQuery:
+    """
+    The filters of an /api/get_events request, normalized so equivalent requests share a cache key.
+    Attributes:
+        window (TimeWindow): Only events that start inside this window match.
+        city (str | None): Only events in this city match, ignoring case.
+        arena (str | None): Only events at the arena with this name match, ignoring case.
+        event_type (EventType | None): Only events of this type match.
+        limit (int | None): The maximum number of events to return.
+    """
+    TIME_FORMAT = "%Y-%m-%d %H:%M"
+    DATE_FORMAT = "%Y-%m-%d"
+    PARAMETERS = ('start', 'end', 'city', 'arena', 'type', 'limit')
+
+    def __init__(self, window: TimeWindow, city: str | None = None, arena: str | None = None,
+                 event_type: EventType | None = None, limit: int | None = None):
+        self.window = window
+        self.city = city
+        self.arena = arena
+        self.event_type = event_type
+        self.limit = limit
+
+    """
+    Build a query from request arguments.
+    start and end accept "%Y-%m-%d %H:%M" or "%Y-%m-%d", where a date-only end covers the whole day.
+    start defaults to now and end to default_hours after start. type accepts an event type's value or name.
+    Args:
+        args (Mapping[str, str]): The request arguments.
+        default_hours (int): The length of the window when end is not given.
+    Returns:
+        EventQuery: The query.
+    Raises:
+        ValueError: If an argument cannot be parsed.
+    """
+    @staticmethod
+    def from_args(args, default_hours: int) -> 'EventQuery':
+        start = EventQuery.parse_time(args.get('start'), 'start', end_of_day=False)
+        if start is None:
+            start = datetime.now().replace(second=0, microsecond=0)
+        end = EventQuery.parse_time(args.get('end'), 'end', end_of_day=True)
+        if end is None:
+            end = start + timedelta(hours=default_hours)
+        if end < start:
+            raise ValueError('end must not be before start')
+
+        return EventQuery(TimeWindow(start, end),
+                          city=EventQuery.parse_text(args.get('city')),
+                          arena=EventQuery.parse_text(args.get('arena')),
+                          event_type=EventQuery.parse_event_type(args.get('type')),
+                          limit=EventQuery.parse_limit(args.get('limit')))
+
+    """
+    Check whether any query parameter is present in request arguments.
+    Args:
+        args (Mapping[str, str]): The request arguments.
+    Returns:
+        bool: True if the request filters the events.
+    """
+    @staticmethod
+    def has_parameters(args) -> bool:
+        return any(args.get(name) for name in EventQuery.PARAMETERS)
+
+    """
+    Parse a start or end argument.
+    Args:
+        value (str | None): The argument.
+        name (str): The argument name, for error messages.
+        end_of_day (bool): Whether a date-only value means the end of the day instead of its start.
+    Returns:
+        datetime | None: The parsed time, or None if the argument is missing.
+    """
+    @staticmethod
+    def parse_time(value: str | None, name: str, end_of_day: bool) -> datetime | None:
+        if not value:
+            return None
+        value = value.strip().replace('T', ' ')
+        try:
+            return datetime.strptime(value, EventQuery.TIME_FORMAT)
+        except ValueError:
+            pass
+        try:
+            day = datetime.strptime(value, EventQuery.DATE_FORMAT)
+        except ValueError:
+            raise ValueError(f'{name} must be formatted as YYYY-MM-DD or YYYY-MM-DD HH:MM')
+        return datetime.combine(day.date(), time(23, 59)) if end_of_day else day
+
+    """
+    Parse a free text argument, collapsing whitespace and ignoring case.
+    Args:
+        value (str | None): The argument.
+    Returns:
+        str | None: The normalized text, or None if the argument is missing or blank.
+    """
+    @staticmethod
+    def parse_text(value: str | None) -> str | None:
+        if not value or not value.strip():
+            return None
+        return ' '.join(value.split()).casefold()
+
+    """
+    Parse a type argument.
+    Args:
+        value (str | None): The event type's value, e.g. "Open Skate", or name, e.g. "OPEN_SKATE".
+    Returns:
+        EventType | None: The event type, or None if the argument is missing.
+    """
+    @staticmethod
+    def parse_event_type(value: str | None) -> EventType | None:
+        text = EventQuery.parse_text(value)
+        if text is None:
+            return None
+        for event_type in EventType:
+            if text in (event_type.value.casefold(), event_type.name.casefold()):
+                return event_type
+        raise ValueError(f'type must be one of: {", ".join(event_type.value for event_type in EventType)}')
+
+    """
+    Parse a limit argument.
+    Args:
+        value (str | None): The argument.
+    Returns:
+        int | None: The limit, or None if the argument is missing.
+    """
+    @staticmethod
+    def parse_limit(value: str | None) -> int | None:
+        if not value:
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if limit <= 0:
+            raise ValueError('limit must be a positive integer')
+        return limit
+
+    """
+    Get a key that is equal for requests with equivalent filters.
+    Returns:
+        str: The cache key.
+    """
+    def get_cache_key(self) -> str:
+        event_type = self.event_type.name if self.event_type is not None else None
+        return json.dumps([self.window.start.strftime(self.TIME_FORMAT), self.window.end.strftime(self.TIME_FORMAT),
+                           self.city, self.arena, event_type, self.limit])
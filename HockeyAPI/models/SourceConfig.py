@@ -0,0 +1,120 @@
+from datetime import timedelta
+from models.Address import Address
+from models.Arena import Arena
+from models.Cost import Cost
+
+
+class SourceConfig:
+    """
+    A location source declared in config/sources.json: which platform adapter reads it, where, and the arenas and
+    costs its events get.
+    Attributes:
+        name (str): The source name, used in logs and metrics.
+        adapter (str): The name of the adapter that fetches and parses the source, see handlers/Handler_Registry.py.
+        refresh_interval (timedelta): How long the source's events stay fresh.
+        url (str): The URL the adapter fetches.
+        arenas (dict[str, Arena]): The source's arenas, keyed by "default" or by the name the site uses for them.
+        costs (dict[str, Cost]): The source's costs, keyed by event kind, e.g. "open_skate" or "stick_and_puck".
+        options (dict): Adapter-specific settings.
+    """
+    DEFAULT_ARENA = 'default'
+
+    def __init__(self, name: str, adapter: str, refresh_interval: timedelta, url: str = "",
+                 arenas: dict[str, Arena] | None = None, costs: dict[str, Cost] | None = None,
+                 options: dict | None = None):
+        self.name = name
+        self.adapter = adapter
+        self.refresh_interval = refresh_interval
+        self.url = url
+        self.arenas = arenas or {}
+        self.costs = costs or {}
+        self.options = options or {}
+
+    """
+    Build a source config from its JSON declaration.
+    Args:
+        data (dict): The declaration, with name, adapter and refresh_hours, and optionally url, arenas, costs
+        and options.
+    Returns:
+        SourceConfig: The source config.
+    Raises:
+        ValueError: If a required field is missing or malformed.
+    """
+    @staticmethod
+    def from_dict(data: dict) -> 'SourceConfig':
+        try:
+            name = data['name']
+            return SourceConfig(
+                name=name,
+                adapter=data['adapter'],
+                refresh_interval=timedelta(hours=float(data['refresh_hours'])),
+                url=data.get('url', ""),
+                arenas={key: SourceConfig.parse_arena(arena) for key, arena in data.get('arenas', {}).items()},
+                costs={key: Cost(cost=float(cost)) for key, cost in data.get('costs', {}).items()},
+                options=data.get('options', {})
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f'Invalid source {data.get("name", data)!r}: {e!r}') from e
+
+    """
+    Build an arena from its JSON declaration.
+    Args:
+        data (dict): The arena's name, address and optional notes.
+    Returns:
+        Arena: The arena.
+    """
+    @staticmethod
+    def parse_arena(data: dict) -> Arena:
+        address = data['address']
+        return Arena(
+            name=data['name'],
+            address=Address(
+                street=address['street'],
+                city=address['city'],
+                state=address['state'],
+                zip_code=address['zip_code']
+            ),
+            notes=data.get('notes', "")
+        )
+
+    """
+    Get one of the source's arenas.
+    Args:
+        key (str, optional): The arena's key. Defaults to the default arena.
+    Returns:
+        Arena: The arena.
+    Raises:
+        ValueError: If the source doesn't declare the arena.
+    """
+    def get_arena(self, key: str = DEFAULT_ARENA) -> Arena:
+        if key not in self.arenas:
+            raise ValueError(f'Source {self.name} has no arena {key!r}')
+        return self.arenas[key]
+
+    """
+    Get one of the source's costs.
+    Args:
+        key (str): The cost's key, e.g. "open_skate".
+    Returns:
+        Cost: The cost.
+    Raises:
+        ValueError: If the source doesn't declare the cost.
+    """
+    def get_cost(self, key: str) -> Cost:
+        if key not in self.costs:
+            raise ValueError(f'Source {self.name} has no cost {key!r}')
+        return self.costs[key]
+
+    """
+    Get an adapter-specific setting.
+    Args:
+        name (str): The setting name.
+        default (optional): The value if the source doesn't set it.
+    Returns:
+        The setting's value.
+    """
+    def get_option(self, name: str, default=None):
+        return self.options.get(name, default)
+
+    def __repr__(self):
+        return f"SourceConfig(name='{self.name}', adapter='{self.adapter}')"
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+
+class TimeWindow:
+    """
+    A range of time that events are fetched for. Both ends are inclusive.
+    Attributes:
+        start (datetime): The start of the window.
+        end (datetime): The end of the window.
+    """
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+
+    """
+    Create a window that starts at midnight today and spans the given number of days.
+    Args:
+        days (int): The number of days the window spans.
+    Returns:
+        TimeWindow: The window.
+    """
+    @staticmethod
+    def from_today(days: int) -> 'TimeWindow':
+        return TimeWindow.from_day(datetime.now(), days)
+
+    """
+    Create a window that starts at midnight of a day and spans the given number of days.
+    Args:
+        day (datetime): Any time on the first day of the window.
+        days (int): The number of days the window spans.
+    Returns:
+        TimeWindow: The window.
+    """
+    @staticmethod
+    def from_day(day: datetime, days: int) -> 'TimeWindow':
+        start_of_day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        return TimeWindow(start_of_day, start_of_day + timedelta(days=days))
+
+    """
+    Check if a time falls inside the window.
+    Args:
+        time (datetime): The time to check.
+    Returns:
+        bool: True if the time is between the start and end of the window.
+    """
+    def contains(self, time: datetime) -> bool:
+        return self.start <= time <= self.end
+
+    """
+    Get the part of the window that another window also covers.
+    Args:
+        other (TimeWindow): The other window.
+    Returns:
+        TimeWindow: The overlap, which contains no time at all if the windows don't overlap.
+    """
+    def get_overlap(self, other: 'TimeWindow') -> 'TimeWindow':
+        return TimeWindow(max(self.start, other.start), min(self.end, other.end))
+
+    """
+    Check if any part of a day falls inside the window.
+    Args:
+        day (datetime): Any time on the day to check.
+    Returns:
+        bool: True if the day overlaps the window.
+    """
+    def contains_day(self, day: datetime) -> bool:
+        return self.start.date() <= day.date() <= self.end.date()
+
+    """
+    Get every month the window overlaps, in order.
+    Returns:
+        list[tuple[int, int]]: The (year, month) of each month.
+    """
+    def get_months(self) -> list[tuple[int, int]]:
+        months = []
+        year, month = self.start.year, self.start.month
+        while (year, month) <= (self.end.year, self.end.month):
+            months.append((year, month))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    """
+    Get every day the window overlaps, in order, at the time of day the window starts.
+    Returns:
+        list[datetime]: One datetime per day.
+    """
+    def get_days(self) -> list[datetime]:
+        days = []
+        day = self.start
+        while day.date() <= self.end.date():
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def __repr__(self):
+        return f"TimeWindow(start='{self.start}', end='{self.end}')"
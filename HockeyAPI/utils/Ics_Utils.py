@@ -0,0 +1,133 @@
+import io
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+ICS_DATE_FORMAT = "%Y%m%d"
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%S"
+
+_TEXT_ESCAPES = {'n': '\n', 'N': '\n', ',': ',', ';': ';', '\\': '\\'}
+
+"""
+A utility module for reading iCalendar (.ics) feeds.
+VEVENT components are read one at a time from the feed's lines, keeping only the requested properties as raw strings,
+so callers can reject events by their raw DTSTART or DESCRIPTION before parsing any dates or unescaping any text.
+"""
+
+"""
+Read the VEVENT components of an iCalendar feed one at a time.
+Properties of nested components, such as VALARM, are ignored.
+Args:
+    feed (str | Iterable[str]): The feed text, or its lines.
+    properties (Iterable[str], optional): The property names to keep, e.g. DTSTART. Defaults to every property.
+Returns:
+    Iterator[dict[str, tuple[str, str]]]: For each event, the (parameters, raw value) of each kept property, keyed by
+    upper-case property name. Repeated properties keep their first value.
+"""
+def iter_vevents(feed: str | Iterable[str], properties: Iterable[str] | None = None) -> Iterator[dict[str, tuple[str, str]]]:
+    lines = io.StringIO(feed) if isinstance(feed, str) else feed
+    wanted = frozenset(name.upper() for name in properties) if properties is not None else None
+    event = None
+    nested_depth = 0
+    for line in _iter_unfolded_lines(lines):
+        prefix = line[:6].upper()
+        if event is None:
+            if prefix == 'BEGIN:' and line.upper() == 'BEGIN:VEVENT':
+                event = {}
+                nested_depth = 0
+            continue
+
+        if prefix == 'BEGIN:':
+            nested_depth += 1
+        elif prefix.startswith('END:'):
+            if nested_depth:
+                nested_depth -= 1
+            elif line.upper() == 'END:VEVENT':
+                yield event
+                event = None
+        elif not nested_depth:
+            name, parameters, value = _split_content_line(line)
+            if (wanted is None or name in wanted) and name not in event:
+                event[name] = (parameters, value)
+
+"""
+Unescape an iCalendar TEXT value, such as a SUMMARY or DESCRIPTION.
+Args:
+    value (str): The raw value.
+Returns:
+    str: The text, with escaped newlines, commas, semicolons and backslashes restored.
+"""
+def unescape_text(value: str) -> str:
+    if '\\' not in value:
+        return value
+
+    parts = []
+    index = 0
+    while index < len(value):
+        character = value[index]
+        if character == '\\' and index + 1 < len(value):
+            escaped = value[index + 1]
+            parts.append(_TEXT_ESCAPES.get(escaped, escaped))
+            index += 2
+        else:
+            parts.append(character)
+            index += 1
+    return ''.join(parts)
+
+"""
+Parse an iCalendar DATE or DATE-TIME value as a naive datetime.
+The wall clock time is kept as written: a TZID parameter or a trailing Z (UTC) is not converted.
+Args:
+    value (str): The raw value, e.g. "20251218T113000", "20251218T173000Z" or "20251218".
+Returns:
+    datetime: The date and time. A DATE value is midnight of that day.
+"""
+def parse_datetime(value: str) -> datetime:
+    value = value.strip().rstrip('Zz')
+    if len(value) == 8:
+        return datetime.strptime(value, ICS_DATE_FORMAT)
+    return datetime.strptime(value[:15], ICS_DATETIME_FORMAT)
+
+"""
+Internal function to unfold the content lines of an iCalendar feed
+A line that starts with a space or tab continues the previous line.
+Args:
+    lines (Iterable[str]): The raw feed lines.
+Returns:
+    Iterator[str]: The unfolded content lines, without line endings.
+"""
+def _iter_unfolded_lines(lines: Iterable[str]) -> Iterator[str]:
+    current = None
+    for raw_line in lines:
+        line = raw_line.rstrip('\r\n')
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+"""
+Internal function to split a content line into its name, parameters and value
+The value starts at the first colon outside a quoted parameter value.
+Args:
+    line (str): The unfolded content line, e.g. "DTSTART;TZID=America/Chicago:20251218T113000".
+Returns:
+    tuple[str, str, str]: The upper-case name, the raw parameters and the raw value.
+"""
+def _split_content_line(line: str) -> tuple[str, str, str]:
+    colon = line.find(':')
+    if colon >= 0 and '"' not in line[:colon]:
+        name, _, parameters = line[:colon].partition(';')
+        return name.upper(), parameters, line[colon + 1:]
+
+    in_quotes = False
+    for index, character in enumerate(line):
+        if character == '"':
+            in_quotes = not in_quotes
+        elif character == ':' and not in_quotes:
+            name, _, parameters = line[:index].partition(';')
+            return name.upper(), parameters, line[index + 1:]
+    return line.upper(), '', ''
@@ -0,0 +1,173 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections.abc import Iterator
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+HANDLER_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# With several gunicorn workers, each writes its metrics to files in this directory and a scrape of any worker
+# aggregates all of them; gunicorn.conf.py empties it when gunicorn starts
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+HANDLER_HTTP_SECONDS = Histogram('hockey_handler_http_seconds',
+                                 'Time a location handler run spent waiting on HTTP requests.',
+                                 ['handler'], buckets=HANDLER_SECONDS_BUCKETS)
+HANDLER_PARSE_SECONDS = Histogram('hockey_handler_parse_seconds',
+                                  'Time a location handler run spent outside HTTP requests, parsing responses.',
+                                  ['handler'], buckets=HANDLER_SECONDS_BUCKETS)
+HANDLER_EVENTS = Gauge('hockey_handler_events', 'Events returned by the last run of a location handler.',
+                       ['handler'], multiprocess_mode='mostrecent')
+HANDLER_BYTES = Counter('hockey_handler_downloaded_bytes', 'Response bytes downloaded by a location handler.',
+                        ['handler'])
+HANDLER_HTTP_REQUESTS = Counter('hockey_handler_http_requests', 'HTTP requests sent by a location handler.',
+                                ['handler', 'status'])
+HANDLER_LAST_SUCCESS = Gauge('hockey_handler_last_success_timestamp_seconds',
+                             'When a location handler last returned events without errors, as a Unix timestamp.',
+                             ['handler'], multiprocess_mode='max')
+HANDLER_ERRORS = Counter('hockey_handler_errors', 'Failed location handler runs, by reason.',
+                         ['handler', 'reason'])
+API_CACHE_REQUESTS = Counter('hockey_api_cache_requests', 'Lookups in the API response cache.', ['cache', 'result'])
+API_COALESCED_REQUESTS = Counter('hockey_api_coalesced_requests',
+                                 'API cache misses that waited for a concurrent request to build the response.',
+                                 ['cache'])
+STREAM_CLIENTS = Gauge('hockey_stream_clients', 'Clients connected to the event stream.', multiprocess_mode='livesum')
+
+_current_run: ContextVar['HandlerRun | None'] = ContextVar('current_handler_run', default=None)
+
+"""
+A utility module for Prometheus instrumentation.
+Location handler runs are wrapped in track_handler_run, and Web_Utils reports every HTTP request with record_http,
+which attributes it to the handler run active in the calling thread. Handlers that catch their own errors and return
+no events report them with record_parse_error in the same way, so the run still counts as failed.
+"""
+
+
+class HandlerRun:
+    """
+    The HTTP activity of a single location handler run.
+    Attributes:
+        name (str): The handler name.
+        http_seconds (float): Time spent in HTTP requests.
+        http_errors (int): HTTP requests that failed or got an error status.
+        parse_errors (int): Errors the handler caught itself while fetching or parsing its sites.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.http_seconds = 0.0
+        self.http_errors = 0
+        self.parse_errors = 0
+
+
+"""
+Track a location handler run: its HTTP and parse time, event count, last success and errors.
+The caller reports the events it got with record_handler_events before the block ends.
+Args:
+    name (str): The handler name.
+Returns:
+    Iterator[HandlerRun]: The run, active for HTTP requests made in this thread until the block ends.
+"""
+@contextmanager
+def track_handler_run(name: str) -> Iterator[HandlerRun]:
+    run = HandlerRun(name)
+    token = _current_run.set(run)
+    started_at = time.perf_counter()
+    try:
+        yield run
+    except Exception:
+        HANDLER_ERRORS.labels(name, 'exception').inc()
+        raise
+    finally:
+        _current_run.reset(token)
+        HANDLER_HTTP_SECONDS.labels(name).observe(run.http_seconds)
+        HANDLER_PARSE_SECONDS.labels(name).observe(max(time.perf_counter() - started_at - run.http_seconds, 0))
+        if run.http_errors:
+            HANDLER_ERRORS.labels(name, 'http').inc()
+        if run.parse_errors:
+            HANDLER_ERRORS.labels(name, 'parse').inc()
+
+"""
+Record the events a tracked handler run returned.
+Args:
+    run (HandlerRun): The run.
+    event_count (int): The number of events.
+"""
+def record_handler_events(run: HandlerRun, event_count: int) -> None:
+    HANDLER_EVENTS.labels(run.name).set(event_count)
+    if event_count and not run.http_errors and not run.parse_errors:
+        HANDLER_LAST_SUCCESS.labels(run.name).set_to_current_time()
+
+"""
+Record a failed handler run that never reported back, such as one that timed out.
+Args:
+    name (str): The handler name.
+    reason (str): Why the run failed.
+"""
+def record_handler_error(name: str, reason: str) -> None:
+    HANDLER_ERRORS.labels(name, reason).inc()
+
+"""
+Record an error a location handler caught itself, against the handler run active in this thread. Errors outside a
+run are ignored.
+"""
+def record_parse_error() -> None:
+    run = _current_run.get()
+    if run is not None:
+        run.parse_errors += 1
+
+"""
+Record an HTTP request against the handler run active in this thread. Requests outside a run are ignored.
+Args:
+    seconds (float): How long the request took.
+    downloaded_bytes (int): The size of the response body.
+    status (str): The response status code, or 'error' if no response was received.
+"""
+def record_http(seconds: float, downloaded_bytes: int, status: str) -> None:
+    run = _current_run.get()
+    if run is None:
+        return
+    run.http_seconds += seconds
+    if not status.isdigit() or int(status) >= 400:
+        run.http_errors += 1
+    HANDLER_BYTES.labels(run.name).inc(downloaded_bytes)
+    HANDLER_HTTP_REQUESTS.labels(run.name, status).inc()
+
+"""
+Record a lookup in an API response cache.
+Args:
+    cache (str): The cache name.
+    hit (bool): Whether the response was found.
+"""
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    API_CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+"""
+Record an API cache miss that shared the response built by a concurrent request instead of building its own.
+Args:
+    cache (str): The cache name.
+"""
+def record_coalesced_request(cache: str) -> None:
+    API_COALESCED_REQUESTS.labels(cache).inc()
+
+"""
+Record how many clients are connected to the event stream.
+Args:
+    count (int): The number of connected clients.
+"""
+def set_stream_clients(count: int) -> None:
+    STREAM_CLIENTS.set(count)
+
+"""
+Render every metric in the Prometheus text format, aggregated over every worker when MULTIPROC_DIR is set.
+Returns:
+    tuple[bytes, str]: The metrics and their content type.
+"""
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,72 @@
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+"""
+A utility module to coalesce concurrent calls for the same key into a single call.
+"""
+
+
+class Call(Generic[T]):
+    """
+    A call in flight, awaited by every caller that asked for its key while it ran.
+    Attributes:
+        done (threading.Event): Set once the call returned or raised.
+        result: The call's return value.
+        error (BaseException | None): The exception the call raised, if any.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs at most one call per key at a time. Callers that ask for a key while its call is running wait for that call
+    and share its result, or its exception, instead of running their own. A key's result is not kept once its call
+    returns, so the next caller after that runs a new call; caching results is left to the caller.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, Call[T]] = {}
+        self._lock = threading.Lock()
+
+    """
+    Run a function for a key, or wait for the call already running for it.
+    Args:
+        key (str): Identifies calls whose results are interchangeable.
+        function (Callable[[], T]): Computes the result.
+    Returns:
+        tuple[T, bool]: The result, and True if it was shared from another caller's call.
+    Raises:
+        BaseException: Whatever the function raised, in the caller that ran it and in every caller waiting on it.
+    """
+    def do(self, key: str, function: Callable[[], T]) -> tuple[T, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -1,77 +1,360 @@
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
 import requests
-from bs4 import BeautifulSoup, ResultSet, Tag
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.Metrics import record_http
 
-PARSER = 'html.parser'
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, ResultSet, Tag
+
+# BeautifulSoup loads the parser by name, so only check lxml is installed without importing it
+DEFAULT_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+
+PARSER = os.environ.get('HTML_PARSER', DEFAULT_PARSER)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
+
+CONNECT_TIMEOUT_SECONDS = float(os.environ.get('HTTP_CONNECT_TIMEOUT_SECONDS', '5'))
+READ_TIMEOUT_SECONDS = float(os.environ.get('HTTP_READ_TIMEOUT_SECONDS', '30'))
+MAX_CONNECTIONS_PER_HOST = int(os.environ.get('HTTP_MAX_CONNECTIONS_PER_HOST', '4'))
+MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '3'))
+RETRY_BACKOFF_FACTOR = float(os.environ.get('HTTP_RETRY_BACKOFF_FACTOR', '0.5'))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', '/tmp/hockey-api/http-cache')
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
 
 """
 A utility module for fetching and parsing web content.
 Provides functions to fetch HTML content from URLs and parse it using BeautifulSoup.
+The query helpers accept either raw HTML or a document already parsed with parse_html, so a handler that queries
+the same page several times only pays for parsing it once. BeautifulSoup is imported on the first parse, so handlers
+that only read JSON or iCalendar responses never load it.
+"""
+
+"""
+Parse an HTML document once so it can be queried many times
+Passing a tag name and/or class name only builds the matching elements (and their children) with a SoupStrainer,
+which is much cheaper than building the whole page when a handler only needs a few elements.
 Args:
     html_body (str): The HTML content of the web page.
+    tag_name (str, optional): Only build elements with this tag name.
+    class_name (str, optional): Only build elements with this class name.
+    parser (str, optional): The BeautifulSoup parser backend. Defaults to lxml when installed, else html.parser.
+Returns:
+    BeautifulSoup: The parsed document.
+"""
+def parse_html(html_body: str, tag_name: str | None = None, class_name: str | None = None,
+               parser: str = PARSER) -> 'BeautifulSoup':
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = None
+    if class_name is not None:
+        # While parsing, the class attribute is still one unsplit string, so match the name as a whole word in it
+        parse_only = SoupStrainer(tag_name, class_=re.compile(rf'(^|\s){re.escape(class_name)}(\s|$)'))
+    elif tag_name is not None:
+        parse_only = SoupStrainer(tag_name)
+    return BeautifulSoup(html_body, parser, parse_only=parse_only)
+
+"""
+Internal function to get a parsed document, parsing raw HTML if needed
+Args:
+    html_body (str | BeautifulSoup): The HTML content of the web page, or an already parsed document.
+Returns:
+    BeautifulSoup: The parsed document.
+"""
+def _as_document(html_body: 'str | BeautifulSoup') -> 'BeautifulSoup':
+    if isinstance(html_body, str):
+        return parse_html(html_body)
+    return html_body
+
+"""
+Get an element by its ID
+Args:
+    html_body (str | BeautifulSoup): The HTML content of the web page, or an already parsed document.
     element_id (str): The ID of the HTML element to retrieve.
 Returns:
     BeautifulSoup | None: The HTML element with the specified ID, or None if not found.
 """
-def get_element_by_id(html_body: str, element_id: str) -> BeautifulSoup | None:
-    soup = BeautifulSoup(html_body, PARSER)
-    element = soup.find(id=element_id)
+def get_element_by_id(html_body: 'str | BeautifulSoup', element_id: str) -> 'BeautifulSoup | None':
+    element = _as_document(html_body).find(id=element_id)
     return element
 
 """
 Get all elements by class name
 Args:
-    html_body (str): The HTML content of the web page.
+    html_body (str | BeautifulSoup): The HTML content of the web page, or an already parsed document.
     class_name (str): The class name of the HTML elements to retrieve.
 Returns:
     ResultSet[Tag] | None: A list of HTML elements with the specified class name, or None if not found.
 """
-def get_elements_by_class(html_body: str, class_name: str) -> ResultSet[Tag] | None:
-    soup = BeautifulSoup(html_body, PARSER)
-    elements = soup.find_all(class_=class_name)
+def get_elements_by_class(html_body: 'str | BeautifulSoup', class_name: str) -> 'ResultSet[Tag] | None':
+    elements = _as_document(html_body).find_all(class_=class_name)
     return elements
 
 """
 Get all elements by tag name
 Args:
-    html_body (str): The HTML content of the web page.
+    html_body (str | BeautifulSoup): The HTML content of the web page, or an already parsed document.
     tag_name (str): The tag name of the HTML elements to retrieve.
 Returns:
     ResultSet[Tag] | None: A list of HTML elements with the specified tag name, or None if not found.
 """
-def get_elements_by_tag_name(html_body: str, tag_name: str) -> ResultSet[Tag] | None:
-    soup = BeautifulSoup(html_body, PARSER)
-    elements = soup.find_all(tag_name)
+def get_elements_by_tag_name(html_body: 'str | BeautifulSoup', tag_name: str) -> 'ResultSet[Tag] | None':
+    elements = _as_document(html_body).find_all(tag_name)
     return elements
 
 """
 Get all elements by CSS selector
 Args:
-    html_body (str): The HTML content of the web page.
+    html_body (str | BeautifulSoup): The HTML content of the web page, or an already parsed document.
     selector (str): The CSS selector of the HTML elements to retrieve.
 Returns:
     ResultSet[Tag] | None: A list of HTML elements matching the CSS selector, or None if not found.
 """
-def get_query_selector(html_body: str, selector: str) -> ResultSet[Tag] | None:
-    soup = BeautifulSoup(html_body, PARSER)
-    elements = soup.select(selector)
+def get_query_selector(html_body: 'str | BeautifulSoup', selector: str) -> 'ResultSet[Tag] | None':
+    elements = _as_document(html_body).select(selector)
     return elements
 
+"""
+Iterate over the items of a JSON array assigned to a JavaScript variable in a page, e.g. `_onlineScheduleList = [...];`
+The page is scanned for the assignment as plain text and the array is decoded one item at a time, so no DOM is built
+and nothing outside the array is decoded.
+Args:
+    html_body (str): The HTML content of the web page.
+    variable_name (str): The name of the JavaScript variable.
+Returns:
+    Iterator: The decoded array items, or nothing if the variable isn't assigned an array.
+"""
+def iter_script_json_array(html_body: str, variable_name: str) -> Iterator:
+    match = _get_script_assignment_pattern(variable_name).search(html_body)
+    if match is not None:
+        yield from _iter_json_array_items(html_body, match.end())
+
+"""
+Internal function to build the pattern matching an array assignment to a variable
+The match ends just after the opening bracket of the array.
+Args:
+    variable_name (str): The name of the JavaScript variable.
+Returns:
+    re.Pattern: The compiled pattern.
+"""
+def _get_script_assignment_pattern(variable_name: str) -> re.Pattern:
+    return re.compile(rf'(?<![\w$.]){re.escape(variable_name)}\s*=\s*\[')
+
+"""
+Internal function to decode the items of a JSON array one at a time
+Args:
+    text (str): The text containing the array.
+    index (int): The position just after the array's opening bracket.
+Returns:
+    Iterator: The decoded items.
+Raises:
+    ValueError: If the text is not a valid JSON array.
+"""
+def _iter_json_array_items(text: str, index: int) -> Iterator:
+    index = _WHITESPACE.match(text, index).end()
+    if text.startswith(']', index):
+        return
+
+    while True:
+        item, index = _JSON_DECODER.raw_decode(text, index)
+        yield item
+        index = _WHITESPACE.match(text, index).end()
+        if text.startswith(',', index):
+            index = _WHITESPACE.match(text, index + 1).end()
+        elif text.startswith(']', index):
+            return
+        else:
+            raise ValueError(f'Expected "," or "]" at position {index}')
+
+"""
+Get the shared HTTP session, creating it on first use.
+All fetches go through this session so connections to the same host are kept alive and reused.
+Returns:
+    requests.Session: The shared session.
+"""
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+"""
+Internal function to create a pooled HTTP session.
+Each host gets its own pool of at most MAX_CONNECTIONS_PER_HOST keep-alive connections; threads wait for a free
+connection instead of opening more. Connection errors and retryable status codes are retried with exponential backoff.
+Returns:
+    requests.Session: The new session.
+"""
+def _create_session() -> requests.Session:
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+        pool_block=True,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 """
 Internal function to perform HTTP GET request
+Responses that carry an ETag or Last-Modified validator are kept in the on-disk HTTP cache. Later fetches of the same
+URL send If-None-Match / If-Modified-Since, and a 304 Not Modified response gets the cached body instead.
 Args:
     url (str): The URL to fetch.
 Returns:
     requests.Response | str: The HTTP response object or an error message.
 """
 def _fetch(url) -> requests.Response | str:
+    started_at = time.perf_counter()
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
-        response = requests.get(url, headers=headers, allow_redirects=True)
+        cached_response = _load_cached_response(url)
+        response = get_session().get(url, headers=_get_conditional_headers(cached_response), allow_redirects=True,
+                                     timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS))
+        _record_response(started_at, response)
         response.raise_for_status()  # Raise an error for bad responses
+        if response.status_code == 304 and cached_response is not None:
+            response._content = cached_response['body']
+            response.encoding = cached_response['encoding']
+        else:
+            _store_cached_response(url, response)
         return response
     except requests.exceptions.RequestException as e:
+        _record_error(started_at, e)
         return f"An error occurred: {e}"
 
+"""
+Internal function to record a received response in the metrics of the running location handler
+Args:
+    started_at (float): The time.perf_counter() value when the request was sent.
+    response (requests.Response): The response.
+"""
+def _record_response(started_at: float, response: requests.Response) -> None:
+    record_http(time.perf_counter() - started_at, len(response.content), str(response.status_code))
+
+"""
+Internal function to record a request that got no response in the metrics of the running location handler
+Args:
+    started_at (float): The time.perf_counter() value when the request was sent.
+    error (requests.exceptions.RequestException): The error.
+"""
+def _record_error(started_at: float, error: requests.exceptions.RequestException) -> None:
+    if error.response is None:
+        record_http(time.perf_counter() - started_at, 0, 'error')
+
+"""
+Internal function to build the conditional request headers for a cached response
+Args:
+    cached_response (dict | None): The cached response, or None if the URL isn't cached.
+Returns:
+    dict: The If-None-Match / If-Modified-Since headers to send.
+"""
+def _get_conditional_headers(cached_response: dict | None) -> dict:
+    headers = {}
+    if cached_response is not None:
+        if cached_response['etag']:
+            headers['If-None-Match'] = cached_response['etag']
+        if cached_response['last_modified']:
+            headers['If-Modified-Since'] = cached_response['last_modified']
+    return headers
+
+"""
+Internal function to get the on-disk HTTP cache paths of a URL
+Args:
+    url (str): The cached URL.
+Returns:
+    tuple[str, str]: The paths of the metadata file and of the body file.
+"""
+def _get_cache_paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f'{key}.json'), os.path.join(HTTP_CACHE_DIR, f'{key}.body')
+
+"""
+Internal function to load a cached response from disk
+Args:
+    url (str): The URL to look up.
+Returns:
+    dict | None: The cached validators, encoding and body, or None if the URL isn't cached.
+"""
+def _load_cached_response(url: str) -> dict | None:
+    metadata_path, body_path = _get_cache_paths(url)
+    try:
+        with open(metadata_path, 'r', encoding='utf-8') as metadata_file:
+            cached_response = json.load(metadata_file)
+        with open(body_path, 'rb') as body_file:
+            cached_response['body'] = body_file.read()
+    except (OSError, ValueError):
+        return None
+
+    if cached_response.get('url') != url:
+        return None
+    return cached_response
+
+"""
+Internal function to store a response in the on-disk HTTP cache if it carries a validator
+The body is written before the metadata, and both are swapped in atomically, so a reader never pairs new
+validators with an old body.
+Args:
+    url (str): The fetched URL.
+    response (requests.Response): The response to store.
+"""
+def _store_cached_response(url: str, response: requests.Response) -> None:
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return
+
+    metadata = {
+        'url': url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'encoding': response.encoding
+    }
+    metadata_path, body_path = _get_cache_paths(url)
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        _write_file_atomically(body_path, response.content)
+        _write_file_atomically(metadata_path, json.dumps(metadata).encode('utf-8'))
+    except OSError as e:
+        print(f'Could not cache response for {url}: {e}')
+
+"""
+Internal function to replace a file's content atomically
+Args:
+    path (str): The file to write.
+    content (bytes): The new content.
+"""
+def _write_file_atomically(path: str, content: bytes) -> None:
+    temporary_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary_path, 'wb') as temporary_file:
+        temporary_file.write(content)
+    os.replace(temporary_path, path)
+
 """
 Internal function to perform HTTP POST request
 Args:
@@ -81,11 +364,15 @@ Returns:
     requests.Response | str: The HTTP response object or an error message.
 """
 def _post(url: str, body: str, headers: dict) -> requests.Response | str:
+    started_at = time.perf_counter()
     try:
-        response = requests.post(url, headers=headers, data=body)
+        response = get_session().post(url, headers=headers, data=body,
+                                      timeout=(CONNECT_TIMEOUT_SECONDS, READ_TIMEOUT_SECONDS))
+        _record_response(started_at, response)
         response.raise_for_status()  # Raise an error for bad responses
         return response
     except requests.exceptions.RequestException as e:
+        _record_error(started_at, e)
         return f"An error occurred: {e}"
 
 """
@@ -113,12 +400,15 @@ Post a body to a URL and get the response as text
 Args:
     url (str): The URL to post to.
     body (str): The body of the POST request.
+    headers (dict, optional): Extra request headers, e.g. a paging header.
 Returns:
     requests.Response | str: The body of the HTTP response as text or an error message.
 """
-def post_body(url, body: str) -> requests.Response | str:
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+def post_body(url, body: str, headers: dict | None = None) -> requests.Response | str:
+    request_headers = {
+        'User-Agent': USER_AGENT,
         'Content-Type': 'application/json;charset=utf-8'
     }
-    return _post(url, body, headers).text
\ No newline at end of file
+    if headers:
+        request_headers.update(headers)
+    return _post(url, body, request_headers).text
\ No newline at end of file
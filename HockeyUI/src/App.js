@@ -4,6 +4,7 @@ import { Footer } from "./Footer";
 import MapView from "./MapView";
 
 const API_URL = process.env.REACT_APP_API_URL || "/api/get_events";
+const STREAM_URL = process.env.REACT_APP_STREAM_URL || "/api/stream";
 
 function formatDateLabel(dateStr) {
   const [year, month, day] = dateStr.split("-").map(Number);
@@ -67,16 +68,32 @@ function App() {
   }, [filterCity, filterDate, filterType, sortBy]);
 
   useEffect(() => {
-    fetch(API_URL)
-      .then((res) => res.json())
-      .then((data) => {
-        setEvents(data);
-        setLoading(false);
-      })
-      .catch(() => {
-        setError("Failed to load events");
-        setLoading(false);
-      });
+    function loadEvents() {
+      fetch(API_URL)
+        .then((res) => res.json())
+        .then((data) => {
+          setEvents(data);
+          setError(null);
+          setLoading(false);
+        })
+        .catch(() => {
+          setError("Failed to load events");
+          setLoading(false);
+        });
+    }
+
+    loadEvents();
+    if (typeof EventSource === "undefined") return undefined;
+
+    // The API pushes a snapshot event whenever the schedule changes, and one on every (re)connect.
+    // The list is revalidated with its ETag, so an unchanged schedule costs a 304.
+    const stream = new EventSource(STREAM_URL);
+    let connected = false;
+    stream.addEventListener("snapshot", () => {
+      if (connected) loadEvents();
+      connected = true;
+    });
+    return () => stream.close();
   }, []);
 
   const cities = useMemo(